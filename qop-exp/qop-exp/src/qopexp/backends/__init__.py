@@ -1,4 +1,4 @@
 # src/qopexp/backends/__init__.py
-from .registry import BackendRegistry, get_backend_registry
+from .registry import BackendRegistry, PreparedBackend, get_backend_registry
 
-__all__ = ["BackendRegistry", "get_backend_registry"]
+__all__ = ["BackendRegistry", "PreparedBackend", "get_backend_registry"]
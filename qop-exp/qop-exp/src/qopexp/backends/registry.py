@@ -1,40 +1,93 @@
 # src/qopexp/backends/registry.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Type
 
+from qopexp.contracts import BackendType
 from qopexp.contracts.protocols import BackendAdapter
 from qopexp.io.artifact_store import ArtifactStore
 
+from .utils import expand_env_vars
 from .replay_backend import ReplayBackendAdapter
 from .sim_backend import SimBackendAdapter
 from .wukong72_backend import Wukong72BackendAdapter
 
 
+# Exact backend_type (or backend name) -> adapter class
+_DISPATCH: Dict[str, Type[BackendAdapter]] = {
+    BackendType.REPLAY.value: ReplayBackendAdapter,
+    BackendType.SIMULATOR.value: SimBackendAdapter,
+    BackendType.REAL_DEVICE.value: Wukong72BackendAdapter,
+    "sim": SimBackendAdapter,
+}
+
+
 @dataclass
 class BackendRegistry:
     store: ArtifactStore
+    # Adapters only hold the store, so one instance per adapter class is reused across calls.
+    _adapters: Dict[type, BackendAdapter] = field(default_factory=dict, init=False, repr=False)
 
-    def resolve(self, backend_cfg: Dict[str, Any]) -> BackendAdapter:
-        name = str(backend_cfg.get("name", "")).lower()
+    @staticmethod
+    def _adapter_cls(backend_cfg: Dict[str, Any]) -> Type[BackendAdapter]:
         params = backend_cfg.get("params", {}) or {}
         btype = str(params.get("backend_type", "")).lower()
+        cls = _DISPATCH.get(btype)
+        if cls is not None:
+            return cls
 
-        if btype == "replay" or "replay" in name:
-            return ReplayBackendAdapter(store=self.store)
+        name = str(backend_cfg.get("name", "")).lower()
+        cls = _DISPATCH.get(name)
+        if cls is not None:
+            return cls
+
+        # Legacy configs without backend_type: route by name hints
+        if "replay" in name:
+            return ReplayBackendAdapter
 
-        if btype == "simulator" or "sim" in name:
-            return SimBackendAdapter(store=self.store)
+        if "sim" in name:
+            return SimBackendAdapter
 
         # Default: real device
-        return Wukong72BackendAdapter(store=self.store)
+        return Wukong72BackendAdapter
+
+    def resolve(self, backend_cfg: Dict[str, Any]) -> BackendAdapter:
+        cls = self._adapter_cls(backend_cfg)
+        adapter = self._adapters.get(cls)
+        if adapter is None:
+            adapter = cls(store=self.store)
+            self._adapters[cls] = adapter
+        return adapter
+
+    def prepare(self, backend_cfg: Dict[str, Any]) -> "PreparedBackend":
+        """
+        Expand ${VAR} and resolve the adapter once; preferred over submit()/ingest()
+        when both are called for the same backend config.
+        """
+        cfg = expand_env_vars(backend_cfg)
+        return PreparedBackend(adapter=self.resolve(cfg), cfg=cfg)
 
     def submit(self, backend_cfg: Dict[str, Any], compiled):
-        return self.resolve(backend_cfg).submit(backend_cfg, compiled)
+        return self.prepare(backend_cfg).submit(compiled)
 
     def ingest(self, backend_cfg: Dict[str, Any], job):
-        return self.resolve(backend_cfg).ingest(backend_cfg, job)
+        return self.prepare(backend_cfg).ingest(job)
+
+
+@dataclass(frozen=True)
+class PreparedBackend:
+    """
+    Adapter bound to an already env-expanded backend config.
+    """
+    adapter: BackendAdapter
+    cfg: Dict[str, Any]
+
+    def submit(self, compiled):
+        return self.adapter.submit(self.cfg, compiled, expanded=True)
+
+    def ingest(self, job):
+        return self.adapter.ingest(self.cfg, job, expanded=True)
 
 
 def get_backend_registry(store: ArtifactStore) -> BackendRegistry:
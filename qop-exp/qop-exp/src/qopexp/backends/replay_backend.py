@@ -13,11 +13,11 @@ from .utils import expand_env_vars, require, get_nested
 class ReplayBackendAdapter:
     store: ArtifactStore
 
-    def submit(self, backend_cfg: Dict[str, Any], compiled):
+    def submit(self, backend_cfg: Dict[str, Any], compiled, *, expanded: bool = False):
         """
         Replay backend does not create real jobs; it returns a JobArtifact that references the replay source.
         """
-        cfg = expand_env_vars(backend_cfg)
+        cfg = backend_cfg if expanded else expand_env_vars(backend_cfg)
         require(cfg, ["name", "params"], where="backend_cfg")
 
         backend_name = str(cfg["name"])
@@ -50,8 +50,8 @@ class ReplayBackendAdapter:
         )
         return env
 
-    def ingest(self, backend_cfg: Dict[str, Any], job):
-        cfg = expand_env_vars(backend_cfg)
+    def ingest(self, backend_cfg: Dict[str, Any], job, *, expanded: bool = False):
+        cfg = backend_cfg if expanded else expand_env_vars(backend_cfg)
         params = cfg.get("params", {}) or {}
         replay = params.get("replay", {}) or {}
         src_aid = str(replay.get("from_artifact_id", ""))
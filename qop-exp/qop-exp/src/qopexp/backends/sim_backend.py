@@ -1,23 +1,79 @@
 # src/qopexp/backends/sim_backend.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-from qopexp.contracts import ArtifactStage, ArtifactRef, CodeRef, ConfigRef
-from qopexp.contracts.result_schema import RAW_SCHEMA_VERSION
+from qopexp.contracts import ArtifactStage, ArtifactRef, CodeRef, ConfigRef
+from qopexp.contracts.result_schema import RAW_SCHEMA_VERSION
 from qopexp.io.artifact_store import ArtifactStore
 from .utils import expand_env_vars, require, get_nested
 
 
+_PRED_RANGE, _PRED_LT, _PRED_OTHER = 0, 1, 2
+_PRED_TYPE_CODES = {"qid_range": _PRED_RANGE, "qid_lt": _PRED_LT}
+
+
+def _num(v: Any) -> float:
+    return float(v) if isinstance(v, (int, float)) else np.nan
+
+
+def _selectivity_from_tags(tag_list: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Vectorized success probability per circuit.
+    Prefer theoretical selectivity from predicate bounds (lo, hi, N).
+    Fallback to explicit selectivity or M/N when bounds are missing, else 0.5.
+    """
+    K = len(tag_list)
+    kind = np.fromiter(
+        (_PRED_TYPE_CODES.get(str(t.get("predicate_type", "")).lower(), _PRED_OTHER) for t in tag_list),
+        dtype=np.int8,
+        count=K,
+    )
+    lo = np.fromiter((_num(t.get("lo")) for t in tag_list), dtype=np.float64, count=K)
+    hi = np.fromiter((_num(t.get("hi")) for t in tag_list), dtype=np.float64, count=K)
+    N = np.fromiter((_num(t.get("N")) for t in tag_list), dtype=np.float64, count=K)
+    sel = np.fromiter((_num(t.get("selectivity")) for t in tag_list), dtype=np.float64, count=K)
+    M = np.fromiter((_num(t.get("M")) for t in tag_list), dtype=np.float64, count=K)
+
+    has_N = ~np.isnan(N) & (N != 0)
+    has_bounds = has_N & ~np.isnan(lo) & ~np.isnan(hi)
+
+    # Apply rules from lowest to highest priority
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.full(K, 0.5, dtype=np.float64)
+        p = np.where(has_N & ~np.isnan(M), np.clip(M / N, 0.0, 1.0), p)
+        p = np.where(~np.isnan(sel), np.clip(sel, 0.0, 1.0), p)
+        p = np.where(has_bounds & (kind == _PRED_LT), np.clip(hi / N, 0.0, 1.0), p)
+        p = np.where(has_bounds & (kind == _PRED_RANGE), np.clip((hi - lo) / N, 0.0, 1.0), p)
+    return p
+
+
 @dataclass
 class SimBackendAdapter:
     store: ArtifactStore
+    # seed -> (generator, freshly-seeded bit generator state)
+    _rngs: Dict[int, Tuple[np.random.Generator, Dict[str, Any]]] = field(default_factory=dict, init=False, repr=False)
 
-    def submit(self, backend_cfg: Dict[str, Any], compiled):
-        cfg = expand_env_vars(backend_cfg)
+    def _rng(self, seed: int) -> np.random.Generator:
+        """
+        Generator for `seed`, rewound to its freshly-seeded state so that every ingest with
+        the same seed draws the same stream (artifact ids stay content-addressed) without
+        re-running SeedSequence hashing and PCG64 construction.
+        """
+        cached = self._rngs.get(seed)
+        if cached is None:
+            rng = np.random.default_rng(seed)
+            self._rngs[seed] = (rng, rng.bit_generator.state)
+            return rng
+        rng, state = cached
+        rng.bit_generator.state = state
+        return rng
+
+    def submit(self, backend_cfg: Dict[str, Any], compiled, *, expanded: bool = False):
+        cfg = backend_cfg if expanded else expand_env_vars(backend_cfg)
         require(cfg, ["name", "params"], where="backend_cfg")
 
         backend_name = str(cfg["name"])
@@ -68,14 +124,14 @@ class SimBackendAdapter:
         )
         return env
 
-    def ingest(self, backend_cfg: Dict[str, Any], job):
+    def ingest(self, backend_cfg: Dict[str, Any], job, *, expanded: bool = False):
         """
         Generates synthetic measurement counts for each circuit.
         Model:
           - 1-bit measurement with success probability p derived from selectivity / M/N
           - counts: {"0": shots*(1-p), "1": shots*p}
         """
-        cfg = expand_env_vars(backend_cfg)
+        cfg = backend_cfg if expanded else expand_env_vars(backend_cfg)
         require(cfg, ["name", "params"], where="backend_cfg")
 
         backend_name = str(cfg["name"])
@@ -90,77 +146,53 @@ class SimBackendAdapter:
 
         compiled_circuits = {str(c["circuit_id"]): c for c in (compiled.payload.get("compiled_circuits") or [])}
 
-        rng = np.random.default_rng(seed)
-
-        def _selectivity_from_tags(tags: Dict[str, Any]) -> float:
-            """
-            Prefer theoretical selectivity from predicate bounds (lo, hi, N).
-            Fallback to explicit selectivity or M/N when bounds are missing.
-            """
-            pred_type = str(tags.get("predicate_type", "")).lower()
-            lo = tags.get("lo", None)
-            hi = tags.get("hi", None)
-            N = tags.get("N", None)
-
-            if isinstance(N, (int, float)) and N:
-                if isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
-                    if pred_type == "qid_range":
-                        return max(0.0, min(1.0, float(hi - lo) / float(N)))
-                    if pred_type == "qid_lt":
-                        return max(0.0, min(1.0, float(hi) / float(N)))
-
-            # Fallbacks
-            sel = tags.get("selectivity", None)
-            if isinstance(sel, (int, float)):
-                return max(0.0, min(1.0, float(sel)))
-            M = tags.get("M", None)
-            if isinstance(N, (int, float)) and N and isinstance(M, (int, float)):
-                return max(0.0, min(1.0, float(M) / float(N)))
-            return 0.5
-
-        results: List[Dict[str, Any]] = []
-        for j in job.payload.get("jobs", []) or []:
-            shots = int(j.get("shots") or 4096)
-            for cid in j.get("circuit_ids", []) or []:
-                c = compiled_circuits.get(str(cid))
-                if c is None:
-                    continue
-                tags = c.get("tags", {}) or {}
-
-                # Derive p from predicate bounds (lo, hi, N) when available
-                p = _selectivity_from_tags(tags)
-
-                # binomial sample
-                ones = int(rng.binomial(n=shots, p=p))
-                zeros = int(shots - ones)
-                counts = {"0": zeros, "1": ones}
-
-                results.append(
-                    {
-                        "job_id": str(j.get("job_id")),
-                        "circuit_id": str(cid),
-                        "shots": shots,
-                        "counts": counts,
-                        "metadata": {
-                            "synthetic": True,
-                            "p_used": p,
-                            "seed": seed,
-                        },
-                        "tags": tags,
-                    }
-                )
-
-        payload = {
-            "backend_name": backend_name,
-            "results": results,
-            "backend_metadata": {
-                "mode": "sim_synthetic_counts",
-                "seed": seed,
-                "result_count": len(results),
-            },
-            "schema_version": RAW_SCHEMA_VERSION,
-            "counts_bit_order": "lsb_rightmost",
-        }
+        rng = self._rng(seed)
+
+        # Pass 1: resolve (job, circuit) pairs
+        pairs = []
+        for j in job.payload.get("jobs", []) or []:
+            job_id = str(j.get("job_id"))
+            shots = int(j.get("shots") or 4096)
+            for cid in j.get("circuit_ids", []) or []:
+                c = compiled_circuits.get(str(cid))
+                if c is None:
+                    continue
+                pairs.append((job_id, str(cid), shots, c.get("tags", {}) or {}))
+
+        # Pass 2: derive p for all circuits at once, then one vectorized binomial draw
+        K = len(pairs)
+        shots_arr = np.fromiter((x[2] for x in pairs), dtype=np.int64, count=K)
+        p_arr = _selectivity_from_tags([x[3] for x in pairs])
+        ones_arr = rng.binomial(n=shots_arr, p=p_arr)
+        zeros_arr = shots_arr - ones_arr
+
+        # Counts stay in the {"0": zeros, "1": ones} shape required by the raw result schema;
+        # everything else per row is plain Python ints/floats pulled from the arrays in bulk.
+        results: List[Dict[str, Any]] = [
+            {
+                "job_id": job_id,
+                "circuit_id": cid,
+                "shots": shots,
+                "counts": {"0": zeros, "1": ones},
+                "metadata": {"synthetic": True, "p_used": p, "seed": seed},
+                "tags": tags,
+            }
+            for (job_id, cid, shots, tags), p, ones, zeros in zip(
+                pairs, p_arr.tolist(), ones_arr.tolist(), zeros_arr.tolist()
+            )
+        ]
+
+        payload = {
+            "backend_name": backend_name,
+            "results": results,
+            "backend_metadata": {
+                "mode": "sim_synthetic_counts",
+                "seed": seed,
+                "result_count": len(results),
+            },
+            "schema_version": RAW_SCHEMA_VERSION,
+            "counts_bit_order": "lsb_rightmost",
+        }
 
         env = self.store.create(
             stage=ArtifactStage.RESULTS_RAW,
@@ -1,25 +1,46 @@
 # src/qopexp/backends/utils.py
 from __future__ import annotations
 
+import functools
 import os
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple, Union
 
 _ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_MISSING = object()
+
+
+def _env_repl(m: re.Match[str]) -> str:
+    return os.environ.get(m.group(1), m.group(0))
 
 
 def expand_env_vars(obj: Any) -> Any:
     if isinstance(obj, str):
-        def _repl(m: re.Match[str]) -> str:
-            k = m.group(1)
-            return os.environ.get(k, m.group(0))
-        return _ENV_PATTERN.sub(_repl, obj)
+        if "${" not in obj:
+            return obj
+        return _ENV_PATTERN.sub(_env_repl, obj)
 
+    # Containers are only copied when a child actually changed; a config subtree without
+    # any ${VAR} reference is returned as-is instead of being rebuilt level by level.
     if isinstance(obj, dict):
-        return {k: expand_env_vars(v) for k, v in obj.items()}
+        out = None
+        for k, v in obj.items():
+            nv = expand_env_vars(v)
+            if nv is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = nv
+        return obj if out is None else out
 
     if isinstance(obj, list):
-        return [expand_env_vars(x) for x in obj]
+        out_list = None
+        for i, x in enumerate(obj):
+            nx = expand_env_vars(x)
+            if nx is not x:
+                if out_list is None:
+                    out_list = list(obj)
+                out_list[i] = nx
+        return obj if out_list is None else out_list
 
     return obj
 
@@ -30,10 +51,20 @@ def require(cfg: Dict[str, Any], keys: List[str], *, where: str) -> None:
         raise ValueError(f"Missing keys at {where}: {missing}")
 
 
-def get_nested(cfg: Dict[str, Any], path: str, default: Any = None) -> Any:
+@functools.lru_cache(maxsize=256)
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(path.split("."))
+
+
+def get_nested(cfg: Dict[str, Any], path: Union[str, Tuple[str, ...]], default: Any = None) -> Any:
+    """
+    Read nested config by dot path ("runtime.seed") or pre-split tuple path (("runtime", "seed")).
+    """
     cur: Any = cfg
-    for part in path.split("."):
-        if not isinstance(cur, dict) or part not in cur:
+    for part in (_split_path(path) if isinstance(path, str) else path):
+        if not isinstance(cur, dict):
+            return default
+        cur = cur.get(part, _MISSING)
+        if cur is _MISSING:
             return default
-        cur = cur[part]
     return cur
@@ -13,6 +13,15 @@ from .tpch_parquet_scan_filter import TPCHParquetScanFilterBaseline
 from .ann_range_verify_real import ANNRangeVerifyBaselineReal
 
 
+# baseline type -> (real-timing implementation, cheap implementation)
+_BASELINE_CLASSES = {
+    "scan_filter": (TPCHParquetScanFilterBaseline, TPCHScanFilterBaseline),
+    "tpch_scan_filter": (TPCHParquetScanFilterBaseline, TPCHScanFilterBaseline),
+    "range_verify": (ANNRangeVerifyBaselineReal, ANNRangeVerifyBaseline),
+    "ann_range_verify": (ANNRangeVerifyBaselineReal, ANNRangeVerifyBaseline),
+}
+
+
 @dataclass
 class BaselineRegistry:
     store: ArtifactStore
@@ -28,19 +37,13 @@ class BaselineRegistry:
             btype = str(b.get("type", "")).lower()
             real = bool(b.get("real_timing", True))  # default: True for paper-quality runs
 
-            # Choose implementation by type and real_timing
-            if btype in ("scan_filter", "tpch_scan_filter"):
-                impl = TPCHParquetScanFilterBaseline(store=self.store) if real else TPCHScanFilterBaseline(store=self.store)
-                outputs.append(impl.run(b, experiment_cfg, workload, dataset_env) if real else impl.run(b, experiment_cfg, workload))
-
-            elif btype in ("range_verify", "ann_range_verify"):
-                impl = ANNRangeVerifyBaselineReal(store=self.store) if real else ANNRangeVerifyBaseline(store=self.store)
-                outputs.append(impl.run(b, experiment_cfg, workload, dataset_env) if real else impl.run(b, experiment_cfg, workload))
-
+            # Choose implementation by type and real_timing.
+            # Conservative default for unknown types: keep old cheap baseline.
+            real_cls, cheap_cls = _BASELINE_CLASSES.get(btype, (None, TPCHScanFilterBaseline))
+            if real and real_cls is not None:
+                outputs.append(real_cls(store=self.store).run(b, experiment_cfg, workload, dataset_env))
             else:
-                # Conservative default: keep old cheap baseline
-                impl = TPCHScanFilterBaseline(store=self.store)
-                outputs.append(impl.run(b, experiment_cfg, workload))
+                outputs.append(cheap_cls(store=self.store).run(b, experiment_cfg, workload))
 
         return outputs
 
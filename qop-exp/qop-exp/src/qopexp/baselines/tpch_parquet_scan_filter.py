@@ -1,14 +1,24 @@
 # src/qopexp/baselines/tpch_parquet_scan_filter.py
 from __future__ import annotations
 
+import functools
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from qopexp.contracts import ArtifactStage, ArtifactRef, CodeRef
 from qopexp.io.artifact_store import ArtifactStore
 from qopexp.baselines.utils import expand_env_vars, require, Stopwatch
 
+logger = logging.getLogger(__name__)
+
 
 def _resolve_tpch_lineitem_path(store: ArtifactStore, dataset_env) -> Path:
     """
@@ -33,25 +43,61 @@ def _resolve_tpch_lineitem_path(store: ArtifactStore, dataset_env) -> Path:
         )
 
     art_dir = store.paths.artifacts_root / ArtifactStage.DATASETS.value / dataset_env.manifest.artifact_id
-    p0 = (art_dir / candidates[0]).resolve()
-    if not p0.exists():
+    return _resolve_cached(str(art_dir), candidates[0])
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_cached(art_dir: str, candidate: str) -> Path:
+    """
+    Resolve an artifact-local (or absolute) candidate path once per (art_dir, candidate).
+    Misses raise and are therefore not cached.
+    """
+    p0 = os.path.realpath(os.path.join(art_dir, candidate))
+    if not os.path.exists(p0):
         # allow absolute path
-        p0 = Path(candidates[0]).expanduser().resolve()
-    if not p0.exists():
+        p0 = os.path.realpath(os.path.expanduser(candidate))
+    if not os.path.exists(p0):
         raise FileNotFoundError(f"Cannot find TPC-H lineitem parquet path: {p0}")
-    return p0
+    return Path(p0)
 
 
-def _arrow_count_rows(parquet_path: Path, shipdate_col: str, cutoff_date: str) -> int:
+def _open_arrow_dataset(parquet_path: Path, shipdate_col: str):
     """
-    Fast path using pyarrow.dataset.
-    cutoff_date is 'YYYY-MM-DD' string.
+    Build the pyarrow dataset, field expression and field type once per run so
+    that Parquet footers/metadata are not re-read for every query.
+    Returns (None, None, None) if pyarrow.dataset is unavailable.
     """
-    import pyarrow.dataset as ds
+    try:
+        import pyarrow.dataset as ds
+    except Exception:
+        return None, None, None
+    # pre_buffer coalesces column-chunk reads; row groups whose min/max
+    # statistics fall outside the predicate are skipped by count_rows.
+    fmt = ds.ParquetFileFormat(
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+    )
+    dataset = ds.dataset(str(parquet_path), format=fmt)
+    return dataset, ds.field(shipdate_col), dataset.schema.field(shipdate_col).type
 
-    dataset = ds.dataset(str(parquet_path), format="parquet")
+
+def _cutoff_scalar(cutoff_date: str, col_type):
+    """
+    Cast the 'YYYY-MM-DD' cutoff once to the column's Arrow type so the filter
+    compares native date/timestamp values instead of coercing per row group.
+    An empty cutoff becomes a null scalar and matches no rows.
+    """
+    import pyarrow as pa
+
+    return pa.scalar(cutoff_date or None, type=pa.string()).cast(col_type)
+
+
+def _arrow_count_rows(dataset, shipdate_field, shipdate_type, cutoff_date: str) -> int:
+    """
+    Fast path using a prebuilt pyarrow.dataset.Dataset.
+    cutoff_date is 'YYYY-MM-DD' string.
+    """
     # shipdate <= cutoff_date
-    expr = (ds.field(shipdate_col) <= cutoff_date)
+    expr = (shipdate_field <= _cutoff_scalar(cutoff_date, shipdate_type))
     try:
         # newer pyarrow provides count_rows
         return int(dataset.count_rows(filter=expr))
@@ -61,28 +107,160 @@ def _arrow_count_rows(parquet_path: Path, shipdate_col: str, cutoff_date: str) -
         return int(tab.num_rows)
 
 
-def _pandas_count_rows(parquet_path: Path, shipdate_col: str, cutoff_date: str) -> int:
+def _load_sorted_column(dataset, shipdate_col: str) -> np.ndarray:
     """
-    Slow fallback. Use only if pyarrow.dataset is unavailable.
+    Decode the shipdate column once and sort it, so every cutoff becomes a
+    binary search instead of a fresh Parquet scan.
+    date32 columns stay int32 epoch days (zero-copy view); other date/timestamp
+    columns become datetime64; string columns are compared lexicographically
+    (same semantics as the Arrow string predicate).
     """
-    import pandas as pd
+    import pyarrow as pa
+
+    col = dataset.to_table(columns=[shipdate_col]).column(shipdate_col).drop_null()
+    if pa.types.is_date32(col.type):
+        vals = col.combine_chunks().view(pa.int32()).to_numpy()
+    elif pa.types.is_date(col.type) or pa.types.is_timestamp(col.type):
+        vals = col.to_numpy()
+    elif pa.types.is_string(col.type) or pa.types.is_large_string(col.type):
+        vals = col.to_numpy().astype(str)
+    else:
+        raise TypeError(f"Unsupported shipdate column type: {col.type}")
+    # Clustered lineitem files are already in ascending shipdate order.
+    if vals.size > 1 and not (vals[:-1] <= vals[1:]).all():
+        vals = np.sort(vals)
+    return vals
 
-    df = pd.read_parquet(parquet_path, columns=[shipdate_col])
-    # pandas may parse date types; compare via string works for ISO format if dtype is string
+
+def _parse_cutoffs(cutoffs: Sequence[str]) -> np.ndarray:
+    """
+    Parse ISO cutoffs to datetime64 in one call; unparseable entries become NaT.
+    """
     try:
-        return int((df[shipdate_col] <= cutoff_date).sum())
+        return np.asarray(cutoffs, dtype="datetime64")
+    except ValueError:
+        pass
+
+    def _one(c: str) -> np.datetime64:
+        try:
+            return np.datetime64(c)
+        except ValueError:
+            return np.datetime64("NaT")
+
+    return np.array([_one(c) for c in cutoffs], dtype="datetime64")
+
+
+def _count_rows_sorted(sorted_vals: np.ndarray, cutoffs: Sequence[str]) -> List[Optional[int]]:
+    """
+    Counts of sorted_vals <= cutoff for all cutoffs in one searchsorted call.
+    Cutoffs that cannot be parsed for this column type map to None.
+    """
+    if sorted_vals.dtype.kind == "U":
+        keys = np.asarray(cutoffs, dtype=str)
+        return [int(m) for m in np.searchsorted(sorted_vals, keys, side="right")]
+
+    keys = _parse_cutoffs(cutoffs)
+    valid = ~np.isnat(keys)
+    keys = keys[valid]
+    if sorted_vals.dtype.kind == "i":
+        # int32 epoch days: shipdate <= cutoff  <=>  day <= floor(cutoff to days)
+        keys = keys.astype("datetime64[D]").astype(np.int64)
+    counts = np.searchsorted(sorted_vals, keys, side="right").tolist()
+
+    out: List[Optional[int]] = [None] * len(cutoffs)
+    for i, m in zip(np.flatnonzero(valid).tolist(), counts):
+        out[i] = m
+    return out
+
+
+def _table_count_rows(parquet_path: Path, shipdate_col: str, cutoff_date: str) -> int:
+    """
+    Fallback without pyarrow.dataset: read only the shipdate column and count in Arrow.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    col = pq.read_table(str(parquet_path), columns=[shipdate_col], pre_buffer=True).column(shipdate_col)
+    cutoff = _cutoff_scalar(cutoff_date, col.type)
+    return int(pc.sum(pc.less_equal(col, cutoff)).as_py() or 0)
+
+
+def _page_cache_fraction(path: Path) -> Optional[float]:
+    """
+    Fraction of the file's pages resident in the OS page cache, via mmap + mincore(2).
+    Returns None where this cannot be determined (non-Linux, ctypes/libc failures).
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import mmap
+
+        size = os.path.getsize(path)
+        if size == 0:
+            return 1.0
+        page = os.sysconf("SC_PAGE_SIZE")
+        n_pages = (size + page - 1) // page
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte)]
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            addr = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+            if addr is None or addr == ctypes.c_void_p(-1).value:
+                return None
+            try:
+                vec = (ctypes.c_ubyte * n_pages)()
+                if libc.mincore(addr, size, vec) != 0:
+                    return None
+                return float((np.frombuffer(vec, dtype=np.uint8) & 1).mean())
+            finally:
+                libc.munmap(addr, size)
+        finally:
+            os.close(fd)
+    except Exception:
+        return None
+
+
+def _prefetch_column(parquet_path: Path, shipdate_col: str) -> None:
+    """
+    Warm the page cache by reading the shipdate column chunks, without
+    evaluating a predicate or counting.
+    """
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(str(parquet_path), pre_buffer=True)
+    for rg in range(pf.num_row_groups):
+        pf.read_row_group(rg, columns=[shipdate_col])
+
+
+def _scan_count_rows(
+    dataset, shipdate_field, shipdate_type, parquet_path: Path, shipdate_col: str, cutoff_date: str
+) -> Tuple[int, str]:
+    """
+    Per-query scan: pyarrow.dataset if available, otherwise the table fallback.
+    Returns (count, engine). Arrow releases the GIL, so this is safe to run in threads.
+    """
+    try:
+        if dataset is None:
+            raise RuntimeError("pyarrow.dataset unavailable")
+        return _arrow_count_rows(dataset, shipdate_field, shipdate_type, cutoff_date), "pyarrow.dataset"
     except Exception:
-        # attempt datetime conversion
-        s = pd.to_datetime(df[shipdate_col])
-        return int((s <= pd.to_datetime(cutoff_date)).sum())
+        return _table_count_rows(parquet_path, shipdate_col, cutoff_date), "pyarrow.parquet"
 
 
 @dataclass
 class TPCHParquetScanFilterBaseline:
     """
-    Real baseline for TPC-H style filter selectivity:
-      - executes a Parquet scan count_rows with predicate l_shipdate <= cutoff
-      - records per-query scan time and aggregates breakdown
+    Real baseline for TPC-H style filter selectivity (count of l_shipdate <= cutoff):
+      - decodes the shipdate column once and answers every cutoff with np.searchsorted;
+        the one-off decode time is split evenly across those rows (scan_time_amortized)
+      - cutoffs that cannot be batched (no pyarrow.dataset, unsupported column type,
+        unparseable cutoff) run a per-query Parquet scan with their own scan time
     """
     store: ArtifactStore
 
@@ -94,38 +272,78 @@ class TPCHParquetScanFilterBaseline:
         shipdate_col = str(cfg.get("shipdate_column", "l_shipdate"))
 
         parquet_path = _resolve_tpch_lineitem_path(self.store, dataset_env)
+        dataset, shipdate_field, shipdate_type = _open_arrow_dataset(parquet_path, shipdate_col)
 
         instances = list((workload.payload.get("instances") or []))
         results: List[Dict[str, Any]] = []
 
         total_scan = 0.0
 
-        # Optional: warmup scan to stabilize filesystem cache
-        warmup = bool(cfg.get("warmup", True))
+        # Optional: warmup read to stabilize filesystem cache.
+        # "auto" skips it when the file is already (mostly) resident in page cache.
+        warmup_cfg = cfg.get("warmup", "auto")
+        if str(warmup_cfg).lower() == "auto":
+            resident = _page_cache_fraction(parquet_path)
+            warmup = resident is None or resident < 0.8
+        else:
+            warmup = bool(warmup_cfg)
         if warmup and instances:
-            cutoff = str((instances[0].get("params") or {}).get("shipdate_cutoff", "1992-01-01"))
-            try:
-                _ = _arrow_count_rows(parquet_path, shipdate_col, cutoff)
-            except Exception:
-                _ = _pandas_count_rows(parquet_path, shipdate_col, cutoff)
+            _prefetch_column(parquet_path, shipdate_col)
 
         with Stopwatch() as sw_total:
-            for inst in instances:
+            cutoffs = [
+                str((inst.get("params", {}) or {}).get("shipdate_cutoff", ""))  # YYYY-MM-DD
+                for inst in instances
+            ]
+
+            # Decode the column once and answer all cutoffs from the sorted values.
+            # The one-off scan cost is attributed evenly to the batched queries.
+            batch_counts: List[Optional[int]] = [None] * len(instances)
+            batch_scan_t = 0.0
+            if dataset is not None and instances:
+                import pyarrow as pa
+
+                with Stopwatch() as sw_batch:
+                    try:
+                        sorted_vals = _load_sorted_column(dataset, shipdate_col)
+                        batch_counts = _count_rows_sorted(sorted_vals, cutoffs)
+                    except (TypeError, pa.ArrowInvalid) as e:
+                        logger.warning(
+                            "Sorted-column path unavailable for %s (%s); falling back to per-query scans",
+                            parquet_path, e,
+                        )
+                n_batched = sum(m is not None for m in batch_counts)
+                batch_scan_t = sw_batch.elapsed / n_batched if n_batched else 0.0
+
+            # Remaining cutoffs are scanned independently; run them on a thread pool.
+            # scan_t stays per-query, so walltime_sec_scan_total may exceed wall clock.
+            def _one(cutoff: str) -> Tuple[int, str, float]:
+                t0 = time.perf_counter()
+                M, engine = _scan_count_rows(
+                    dataset, shipdate_field, shipdate_type, parquet_path, shipdate_col, cutoff
+                )
+                return M, engine, time.perf_counter() - t0
+
+            pending = [i for i, M in enumerate(batch_counts) if M is None]
+            scans: Dict[int, Tuple[int, str, float]] = {}
+            if pending:
+                max_workers = int(cfg.get("max_workers", os.cpu_count() or 1))
+                with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as ex:
+                    scans = dict(zip(pending, ex.map(_one, [cutoffs[i] for i in pending])))
+
+            for i, (inst, cutoff, M) in enumerate(zip(instances, cutoffs, batch_counts)):
                 qid = str(inst.get("query_id"))
-                params = inst.get("params", {}) or {}
-                cutoff = str(params.get("shipdate_cutoff", ""))  # YYYY-MM-DD
                 tags = inst.get("tags", {}) or {}
 
                 # Index/scan breakdown: for Parquet scan, we attribute to scan_time.
-                with Stopwatch() as sw_scan:
-                    try:
-                        M = _arrow_count_rows(parquet_path, shipdate_col, cutoff)
-                        engine = "pyarrow.dataset"
-                    except Exception:
-                        M = _pandas_count_rows(parquet_path, shipdate_col, cutoff)
-                        engine = "pandas.read_parquet"
+                if M is not None:
+                    scan_t = batch_scan_t
+                    engine = "numpy_searchsorted_sorted_column"
+                    amortized = True
+                else:
+                    M, engine, scan_t = scans[i]
+                    amortized = False
 
-                scan_t = sw_scan.elapsed
                 total_scan += scan_t
 
                 # Need N for selectivity. Prefer tags/predicate N, otherwise None.
@@ -166,6 +384,7 @@ class TPCHParquetScanFilterBaseline:
                             "walltime_sec_verify": 0.0,
                             "walltime_sec_post": 0.0,
                             "walltime_sec_total": scan_t,
+                            "scan_time_amortized": amortized,
                         },
                         "tags": tags,
                     }
@@ -9,6 +9,13 @@ from qopexp.io.artifact_store import ArtifactStore
 from qopexp.baselines.utils import expand_env_vars, require, Stopwatch
 
 
+# Immutable fields shared by every result row; nested dicts are built per row.
+_ROW_TEMPLATE: Dict[str, Any] = {
+    "variant": "classical",
+    "shots": None,
+}
+
+
 @dataclass
 class TPCHScanFilterBaseline:
     store: ArtifactStore
@@ -21,6 +28,8 @@ class TPCHScanFilterBaseline:
         instances = list((workload.payload.get("instances") or []))
 
         results: List[Dict[str, Any]] = []
+        # Per-run constant fields; each row merges its own values over this template.
+        base_row = _ROW_TEMPLATE | {"baseline_name": name, "baseline_type": btype}
         with Stopwatch() as sw:
             for inst in instances:
                 qid = str(inst.get("query_id"))
@@ -33,19 +42,14 @@ class TPCHScanFilterBaseline:
 
                 # Minimal baseline: p_hat == p_true, and "time" is amortized later.
                 results.append(
-                    {
+                    base_row
+                    | {
                         "query_id": qid,
-                        "variant": "classical",
-                        "baseline_name": name,
-                        "baseline_type": btype,
-                        "shots": None,
                         "p_hat": p_true,
                         "p_true": p_true,
                         "abs_error": 0.0 if p_true is not None else None,
                         "rel_error": 0.0 if (p_true is not None and p_true != 0) else None,
-                        "metadata": {
-                            "method": "qid_lt_closed_form",
-                        },
+                        "metadata": {"method": "qid_lt_closed_form"},
                         "tags": tags,
                     }
                 )
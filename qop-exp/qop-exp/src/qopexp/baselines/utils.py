@@ -10,18 +10,37 @@ from typing import Any, Dict, List, Optional
 _ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
 
 
+def _env_repl(m: re.Match[str]) -> str:
+    return os.environ.get(m.group(1), m.group(0))
+
+
 def expand_env_vars(obj: Any) -> Any:
     if isinstance(obj, str):
-        def _repl(m: re.Match[str]) -> str:
-            k = m.group(1)
-            return os.environ.get(k, m.group(0))
-        return _ENV_PATTERN.sub(_repl, obj)
+        if "${" not in obj:
+            return obj
+        return _ENV_PATTERN.sub(_env_repl, obj)
 
+    # Containers are only copied when a child actually changed; a config subtree without
+    # any ${VAR} reference is returned as-is instead of being rebuilt level by level.
     if isinstance(obj, dict):
-        return {k: expand_env_vars(v) for k, v in obj.items()}
+        out = None
+        for k, v in obj.items():
+            nv = expand_env_vars(v)
+            if nv is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = nv
+        return obj if out is None else out
 
     if isinstance(obj, list):
-        return [expand_env_vars(x) for x in obj]
+        out_list = None
+        for i, x in enumerate(obj):
+            nx = expand_env_vars(x)
+            if nx is not x:
+                if out_list is None:
+                    out_list = list(obj)
+                out_list[i] = nx
+        return obj if out_list is None else out_list
 
     return obj
 
@@ -33,18 +52,26 @@ def require(cfg: Dict[str, Any], keys: List[str], *, where: str) -> None:
 
 
 class Stopwatch:
+    """
+    Context-manager timer; elapsed is frozen at __exit__ (live while running).
+    """
+    __slots__ = ("t0", "t1")
+
     def __init__(self):
         self.t0 = None
+        self.t1 = None
 
     def __enter__(self):
         self.t0 = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc, tb):
+        self.t1 = time.perf_counter()
         return False
 
     @property
     def elapsed(self) -> float:
         if self.t0 is None:
             return 0.0
-        return float(time.perf_counter() - self.t0)
+        end = self.t1 if self.t1 is not None else time.perf_counter()
+        return float(end - self.t0)
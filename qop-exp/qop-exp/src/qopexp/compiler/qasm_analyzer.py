@@ -8,10 +8,23 @@ from typing import Dict, Tuple
 
 _QREG_RE = re.compile(r"^\s*qreg\s+([A-Za-z_][A-Za-z0-9_]*)\s*\[\s*(\d+)\s*\]\s*;\s*$")
 # Gate lines are assumed to be "op args;" style; we keep it permissive.
-_CX_RE = re.compile(r"^\s*cx\s+")
-_MEASURE_RE = re.compile(r"^\s*measure\s+")
-_COMMENT_RE = re.compile(r"^\s*//")
-_EMPTY_RE = re.compile(r"^\s*$")
+_HEADER_PREFIXES = ("OPENQASM", "include", "creg")
+
+# Whole-buffer variants of the per-line rules, for '\n'-separated programs.
+# Each pattern starts at a literal '\n' (the buffer is prefixed with one) so the
+# regex engine can skip between line starts; [^\S\n] keeps matches on one line.
+_ML_QREG_RE = re.compile(
+    r"\n[^\S\n]*qreg[^\S\n]+[A-Za-z_][A-Za-z0-9_]*[^\S\n]*\[[^\S\n]*(\d+)[^\S\n]*\][^\S\n]*;[^\S\n]*$",
+    re.M,
+)
+_ML_CX_RE = re.compile(r"\n(?=[^\S\n]*cx[^\S\n])")
+# Non-comment, non-header lines that are cx/measure ops or contain ';' (includes qreg lines).
+# Zero-width after the '\n' so findall() only yields cached one-char strings.
+_ML_OP_RE = re.compile(
+    r"\n(?![^\S\n]*(?://|OPENQASM|include|creg))(?=[^\S\n]*(?:(?:cx|measure)[^\S\n]|[^\n;]*;))"
+)
+# Line breaks other than '\n' that str.splitlines() honours; these need the line loop.
+_OTHER_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
 
 
 @dataclass(frozen=True)
@@ -40,35 +53,50 @@ def analyze_qasm2(qasm: str) -> QasmMetrics:
 
     This is intentionally simple and backend-agnostic.
     """
+    if not _OTHER_BREAKS_RE.search(qasm):
+        # Scan the raw buffer with three compiled passes instead of a Python loop per line.
+        buf = "\n" + qasm
+        qregs = _ML_QREG_RE.findall(buf)
+        qubits = sum(int(n) for n in qregs)
+        cx = len(_ML_CX_RE.findall(buf))
+        gate_lines = len(_ML_OP_RE.findall(buf)) - len(qregs)
+        return QasmMetrics(qubits=qubits, cx_gates=cx, gate_lines=gate_lines, depth_est=gate_lines)
+
     qubits = 0
     cx = 0
     gate_lines = 0
 
     for line in qasm.splitlines():
-        if _EMPTY_RE.match(line) or _COMMENT_RE.match(line):
+        s = line.lstrip()
+        if not s or s.startswith("//"):
             continue
 
-        m = _QREG_RE.match(line)
-        if m:
-            qubits += int(m.group(2))
-            continue
+        # Dispatch on the first token; the regex is only needed for qreg captures.
+        op = s.split(None, 1)[0]
+        has_args = len(s) > len(op)
+
+        if op == "qreg":
+            m = _QREG_RE.match(line)
+            if m:
+                qubits += int(m.group(2))
+                continue
 
         # Skip headers/includes/creg
-        if line.strip().startswith(("OPENQASM", "include", "creg")):
+        if s.startswith(_HEADER_PREFIXES):
             continue
 
         # Count operations
-        if _CX_RE.match(line):
+        if op == "cx" and has_args:
             cx += 1
             gate_lines += 1
             continue
 
-        if _MEASURE_RE.match(line):
+        if op == "measure" and has_args:
             gate_lines += 1
             continue
 
         # Treat other op lines as gate lines if they end with ';'
-        if ";" in line:
+        if ";" in s:
             gate_lines += 1
 
     depth_est = gate_lines
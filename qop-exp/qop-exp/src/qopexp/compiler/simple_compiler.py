@@ -4,9 +4,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from qopexp.contracts import ArtifactStage, ArtifactRef, CodeRef, ConfigRef
 from qopexp.io.artifact_store import ArtifactStore
-from qopexp.compiler.qasm_analyzer import analyze_qasm2
+from qopexp.compiler.qasm_analyzer import QasmMetrics, analyze_qasm2
 from qopexp.compiler.utils import expand_env_vars, require, get_nested
 
 
@@ -53,36 +55,37 @@ class SimpleCompiler:
         circuits = list(cp.get("circuits") or [])
         compiled_circuits: List[Dict[str, Any]] = []
 
-        # Aggregate metrics
-        agg = {
-            "backend_name": backend_name,
-            "compiled_count": len(circuits),
-            "compile_qubits_max": 0,
-            "compile_2q_gates_sum": 0,
-            "compile_depth_est_max": 0,
-        }
+        per_circuit_metrics: List[QasmMetrics] = []
 
         for c in circuits:
             cid = str(c.get("circuit_id"))
             qasm = str(c.get("qasm", ""))
 
             qm = analyze_qasm2(qasm)
-            md = qm.to_dict()
-
-            agg["compile_qubits_max"] = max(agg["compile_qubits_max"], md["compile_qubits"])
-            agg["compile_2q_gates_sum"] += int(md["compile_2q_gates"])
-            agg["compile_depth_est_max"] = max(agg["compile_depth_est_max"], md["compile_depth_est"])
+            per_circuit_metrics.append(qm)
 
             compiled_circuits.append(
                 {
                     "circuit_id": cid,
                     "qasm": qasm,  # pass-through
                     "mapping": None,  # placeholder for future mapping info
-                    "metrics": md,
+                    "metrics": qm.to_dict(),
                     "tags": c.get("tags", {}) or {},
                 }
             )
 
+        # Aggregate metrics: one (n, 3) column block, reduced in numpy
+        cols = np.array(
+            [(m.qubits, m.cx_gates, m.depth_est) for m in per_circuit_metrics], dtype=np.int64
+        ).reshape(-1, 3)
+        agg = {
+            "backend_name": backend_name,
+            "compiled_count": len(circuits),
+            "compile_qubits_max": int(cols[:, 0].max(initial=0)),
+            "compile_2q_gates_sum": int(cols[:, 1].sum()),
+            "compile_depth_est_max": int(cols[:, 2].max(initial=0)),
+        }
+
         payload: Dict[str, Any] = {
             "backend_name": backend_name,
             "compiler": {
@@ -96,13 +99,9 @@ class SimpleCompiler:
         # Record config refs (optional)
         config_refs: List[ConfigRef] = []
 
-        # backend config ref
-        if isinstance(bcfg_path, str) and bcfg_path:
-            from qopexp.io.hashing import sha256_file
-            try:
-                config_refs.append(ConfigRef(path=bcfg_path, sha256=sha256_file(bcfg_path)))
-            except Exception:
-                pass
+        # backend config ref (same file as the backend profile hashed above)
+        if backend_profile_sha256 is not None:
+            config_refs.append(ConfigRef(path=bcfg_path, sha256=backend_profile_sha256))
 
         # circuit config ref if injected upstream
         ccfg_path = getattr(circuit.manifest, "extra", {}).get("kernel_cfg_path")  # optional future
@@ -14,7 +14,7 @@ from .manifest import ArtifactManifest
 
 class DatasetPayload(TypedDict, total=False):
     dataset_name: str
-    storage_format: str                  # parquet / hdf5 / npz / mixed
+    storage_format: str                  # parquet / hdf5 / npz / npy / mixed
     root_dir: str
     tables: List[str]                    # for relational datasets
     vector_dim: int                      # for vector datasets
@@ -121,18 +121,20 @@ CuratedResultArtifact = ArtifactEnvelope
 # Helpers for stage naming
 # -------------------------
 
+_KIND_TO_STAGE: Dict[str, ArtifactStage] = {
+    "DatasetArtifact": ArtifactStage.DATASETS,
+    "WorkloadInstanceArtifact": ArtifactStage.WORKLOAD_INSTANCES,
+    "PlanArtifact": ArtifactStage.PLANS,
+    "CircuitArtifact": ArtifactStage.CIRCUITS,
+    "CompiledCircuitArtifact": ArtifactStage.COMPILED,
+    "JobArtifact": ArtifactStage.JOBS,
+    "RawResultArtifact": ArtifactStage.RESULTS_RAW,
+    "CuratedResultArtifact": ArtifactStage.RESULTS_CURATED,
+}
+
+
 def expected_stage_for_kind(kind: str) -> Optional[ArtifactStage]:
     """
     Optional helper for validation / routing.
     """
-    mapping = {
-        "DatasetArtifact": ArtifactStage.DATASETS,
-        "WorkloadInstanceArtifact": ArtifactStage.WORKLOAD_INSTANCES,
-        "PlanArtifact": ArtifactStage.PLANS,
-        "CircuitArtifact": ArtifactStage.CIRCUITS,
-        "CompiledCircuitArtifact": ArtifactStage.COMPILED,
-        "JobArtifact": ArtifactStage.JOBS,
-        "RawResultArtifact": ArtifactStage.RESULTS_RAW,
-        "CuratedResultArtifact": ArtifactStage.RESULTS_CURATED,
-    }
-    return mapping.get(kind)
+    return _KIND_TO_STAGE.get(kind)
@@ -1,7 +1,7 @@
 # src/qopexp/contracts/manifest.py
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -12,7 +12,7 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CodeRef:
     """
     Immutable reference to the producing code version.
@@ -24,10 +24,10 @@ class CodeRef:
     dirty: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {"git_commit": self.git_commit, "version": self.version, "dirty": self.dirty}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConfigRef:
     """
     Reference to a config file and its content hash (for provenance and reproducibility).
@@ -37,10 +37,10 @@ class ConfigRef:
     sha256: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {"path": self.path, "sha256": self.sha256}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArtifactRef:
     """
     Lightweight pointer to an upstream artifact (by stage + artifact_id).
@@ -53,7 +53,7 @@ class ArtifactRef:
         return {"stage": self.stage.value, "artifact_id": self.artifact_id}
 
 
-@dataclass
+@dataclass(slots=True)
 class ArtifactManifest:
     """
     Required metadata for every artifact directory:
@@ -97,9 +97,9 @@ class ArtifactManifest:
             "kind": self.kind,
             "description": self.description,
             "created_at_utc": self.created_at_utc,
-            "inputs": [x.to_dict() for x in self.inputs],
+            "inputs": [x.to_dict() for x in self.inputs] if self.inputs else [],
             "code_ref": self.code_ref.to_dict(),
-            "config_refs": [c.to_dict() for c in self.config_refs],
+            "config_refs": [c.to_dict() for c in self.config_refs] if self.config_refs else [],
             "seed": self.seed,
             "backend_name": self.backend_name,
             "backend_profile_sha256": self.backend_profile_sha256,
@@ -63,9 +63,14 @@ class BackendAdapter(Protocol):
     """
     Executes compiled circuits and returns raw results.
     Real-device adapters must enforce runtime policies (timeouts, shot caps, retries).
-    """
-    def submit(self, backend_cfg: Dict[str, Any], compiled: CompiledCircuitArtifact) -> JobArtifact: ...
-    def ingest(self, backend_cfg: Dict[str, Any], job: JobArtifact) -> RawResultArtifact: ...
+    expanded=True means backend_cfg already had ${VAR} references expanded by the caller.
+    """
+    def submit(
+        self, backend_cfg: Dict[str, Any], compiled: CompiledCircuitArtifact, *, expanded: bool = False
+    ) -> JobArtifact: ...
+    def ingest(
+        self, backend_cfg: Dict[str, Any], job: JobArtifact, *, expanded: bool = False
+    ) -> RawResultArtifact: ...
 
 
 @runtime_checkable
@@ -2,28 +2,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Any
-
-
-RAW_SCHEMA_VERSION = 1
-CURATED_SCHEMA_VERSION = 1
-
-# Raw results payload schema:
-# - payload.results: list of per-circuit results with counts
-# - counts may be a 1-bit dict {"0": x, "1": y} or full bitstring counts
-# - for full bitstring counts, success is defined by the measured flag bit (default c[0])
-RAW_RESULT_FIELDS_V1: List[str] = [
-    "job_id",
-    "circuit_id",
-    "shots",
-    "counts",
-    "metadata",
-    "tags",
-]
+from typing import FrozenSet, List, Dict, Any, Optional, Sequence, Tuple
+
+
+RAW_SCHEMA_VERSION = 1
+CURATED_SCHEMA_VERSION = 1
+
+# Raw results payload schema:
+# - payload.results: list of per-circuit results with counts
+# - counts may be a 1-bit dict {"0": x, "1": y} or full bitstring counts
+# - for full bitstring counts, success is defined by the measured flag bit (default c[0])
+RAW_RESULT_FIELDS_V1: List[str] = [
+    "job_id",
+    "circuit_id",
+    "shots",
+    "counts",
+    "metadata",
+    "tags",
+]
 
 # Recommended canonical columns for results_curated payload table.
 # Keep this stable; only bump CURATED_SCHEMA_VERSION when breaking changes occur.
-CURATED_COLUMNS_V1: List[str] = [
+CURATED_COLUMNS_V1: Tuple[str, ...] = (
     # Identity / provenance
     "experiment_name",
     "dataset_name",
@@ -64,19 +64,57 @@ CURATED_COLUMNS_V1: List[str] = [
     "failure_reason",             # str or empty
     "seed",
     "repeat_id",
-]
+)
+
+# Membership view of CURATED_COLUMNS_V1 (the tuple keeps column order for output).
+CURATED_COLUMNS_V1_SET: FrozenSet[str] = frozenset(CURATED_COLUMNS_V1)
+
+# Logical column types for typed (Parquet) curated tables: "string" | "int64" | "float64" | "bool".
+CURATED_COLUMN_TYPES_V1: Dict[str, str] = {
+    "experiment_name": "string",
+    "dataset_name": "string",
+    "workload_name": "string",
+    "kernel_name": "string",
+    "backend_name": "string",
+    "variant": "string",
+    "N": "int64",
+    "selectivity": "float64",
+    "dim": "int64",
+    "topk": "int64",
+    "shots": "int64",
+    "grover_iterations": "int64",
+    "ae_k": "int64",
+    "success_rate": "float64",
+    "abs_error": "float64",
+    "rel_error": "float64",
+    "confidence_level": "float64",
+    "ci_low": "float64",
+    "ci_high": "float64",
+    "compile_depth": "int64",
+    "compile_2q_gates": "int64",
+    "compile_qubits": "int64",
+    "walltime_sec_total": "float64",
+    "walltime_sec_device": "float64",
+    "walltime_sec_orchestration": "float64",
+    "fallback_used": "bool",
+    "failure_reason": "string",
+    "seed": "int64",
+    "repeat_id": "int64",
+}
 
 
 @dataclass(frozen=True)
 class CuratedTableSpec:
     schema_version: int
-    columns: List[str]
+    columns: Sequence[str]
+    column_types: Optional[Dict[str, str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {"schema_version": self.schema_version, "columns": list(self.columns)}
 
 
-CURATED_TABLE_SPEC_V1 = CuratedTableSpec(
-    schema_version=CURATED_SCHEMA_VERSION,
-    columns=CURATED_COLUMNS_V1,
-)
+CURATED_TABLE_SPEC_V1 = CuratedTableSpec(
+    schema_version=CURATED_SCHEMA_VERSION,
+    columns=CURATED_COLUMNS_V1,
+    column_types=CURATED_COLUMN_TYPES_V1,
+)
@@ -1,7 +1,7 @@
 # src/qopexp/contracts/validation.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Collection, Dict, Optional
 
 from .artifacts import expected_stage_for_kind, ArtifactEnvelope
 from .enums import ArtifactStage
@@ -40,7 +40,9 @@ def validate_envelope(envelope: ArtifactEnvelope) -> None:
             raise ContractError("CuratedResultArtifact payload must include table_path")
 
 
-def require_keys(obj: Dict[str, Any], keys: list[str], *, where: str) -> None:
-    missing = [k for k in keys if k not in obj]
+def require_keys(obj: Dict[str, Any], keys: Collection[str], *, where: str) -> None:
+    # Set difference runs in C; keys may be a precomputed frozenset for hot paths.
+    missing = (keys if isinstance(keys, frozenset) else frozenset(keys)).difference(obj.keys())
     if missing:
-        raise ContractError(f"Missing keys at {where}: {missing}")
+        ordered = [k for k in keys if k in missing] if not isinstance(keys, (set, frozenset)) else sorted(missing)
+        raise ContractError(f"Missing keys at {where}: {ordered}")
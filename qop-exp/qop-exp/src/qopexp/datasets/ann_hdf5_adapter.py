@@ -1,6 +1,11 @@
 # src/qopexp/datasets/ann_hdf5_adapter.py
 from __future__ import annotations
 
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
@@ -17,62 +22,157 @@ from qopexp.io.artifact_store import ArtifactStore
 from qopexp.io.hashing import sha256_file
 from qopexp.datasets.utils import expand_env_vars, ensure_dir, require, get_nested
 
+logger = logging.getLogger(__name__)
+
 
 def _l2_normalize(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
-    n = np.linalg.norm(x, axis=1, keepdims=True)
-    return x / (n + eps)
+    """Row-wise L2 normalization, in place on x (one read+write pass)."""
+    inv = np.einsum("ij,ij->i", x, x)
+    np.sqrt(inv, out=inv)
+    inv += eps
+    np.reciprocal(inv, out=inv)
+    x *= inv[:, None]
+    return x
 
 
 def _random_projection_1d(x: np.ndarray, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
     rng = np.random.default_rng(seed)
-    w = rng.standard_normal((x.shape[1],), dtype=np.float64)
-    w = w / (np.linalg.norm(w) + 1e-12)
+    w = rng.standard_normal((x.shape[1],), dtype=np.float32)
+    w = w / (np.linalg.norm(w) + np.float32(1e-12))
     proj = x @ w
-    return proj.astype(np.float64), w
+    return proj, w
 
 
-def _pca_first_component_1d(x: np.ndarray, *, max_samples: int = 20000, iters: int = 30, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+def _pca_first_component_1d(
+    x: np.ndarray, *, max_samples: int = 20000, n_iter: int = 2, n_oversamples: int = 5, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Lightweight PCA-1D via power iteration on covariance using a subsample.
-    Returns (projection, component_vector).
+    Lightweight PCA-1D via randomized SVD (Halko et al.) on a centered subsample.
+    Returns (projection, component_vector), both float32.
     """
     rng = np.random.default_rng(seed)
-    n = x.shape[0]
-    if n > max_samples:
-        idx = rng.choice(n, size=max_samples, replace=False)
-        xs = x[idx].astype(np.float64)
-    else:
-        xs = x.astype(np.float64)
-
-    mu = xs.mean(axis=0, keepdims=True)
-    xc = xs - mu
-
-    # Power iteration on covariance matrix C = X^T X
-    v = rng.standard_normal((x.shape[1],), dtype=np.float64)
-    v = v / (np.linalg.norm(v) + 1e-12)
-    for _ in range(iters):
-        # compute (X^T X) v without materializing C
-        t = xc @ v
-        v_new = xc.T @ t
-        v = v_new / (np.linalg.norm(v_new) + 1e-12)
-
-    # Project full data with mean from xs
-    mu_full = x.astype(np.float64).mean(axis=0, keepdims=True)
-    proj = (x.astype(np.float64) - mu_full) @ v
-    return proj.astype(np.float64), v
+    n, dim = x.shape
+    xs = x[rng.choice(n, size=max_samples, replace=False)] if n > max_samples else x
 
+    # Means are accumulated in float64 (dim-sized, cheap) to avoid float32 drift over large N.
+    mu = xs.mean(axis=0, dtype=np.float64).astype(np.float32)
+    xc = xs - mu
 
-def _read_hdf5_vectors(path: Path, base_key: str, query_key: str) -> Tuple[np.ndarray, np.ndarray]:
+    # Randomized range finder: sketch with a few Gaussian directions, then n_iter
+    # QR-stabilized subspace iterations; each step is a GEMM over xc, not a GEMV.
+    k = min(1 + n_oversamples, dim, xc.shape[0]) or 1
+    q, _ = np.linalg.qr(xc @ rng.standard_normal((dim, k), dtype=np.float32))
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(xc.T @ q)
+        q, _ = np.linalg.qr(xc @ q)
+    _, _, vt = np.linalg.svd(q.T @ xc, full_matrices=False)
+    v = vt[0]
+    # Deterministic sign: largest-magnitude coordinate is positive.
+    if v[np.argmax(np.abs(v))] < 0:
+        v = -v
+
+    # Project full data centered by the sample mean (the full mean for n <= max_samples);
+    # x @ v - mu @ v avoids both a second pass over x and a centered N x dim copy.
+    proj = x @ v
+    proj -= np.float32(mu @ v)
+    return proj, v
+
+
+def _save_npy_dir(path: Path, **arrays: np.ndarray) -> None:
+    """
+    Write each array uncompressed as <path>/<key>.npy so readers can np.load(..., mmap_mode="r").
+    Files are written to a temp name and renamed, so an interrupted build never leaves a truncated array.
+    """
+    ensure_dir(path)
+    # One scandir instead of a stat per array for the write-idempotency check.
+    with os.scandir(path) as it:
+        existing = {e.name for e in it}
+    for key, arr in arrays.items():
+        if f"{key}.npy" in existing:
+            continue
+        dst = path / f"{key}.npy"
+        tmp = path / f".{key}.npy.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, arr)
+        os.replace(tmp, dst)
+
+
+_HDF5_RDCC_NBYTES = 64 << 20
+# Below this size process startup outweighs parallel chunk decompression.
+_PARALLEL_READ_MIN_BYTES = 64 << 20
+
+
+def _read_hdf5_dataset_f32(ds: Any) -> np.ndarray:
+    out = np.empty(ds.shape, dtype=np.float32)
+    if out.size:
+        ds.read_direct(out)
+    return out
+
+
+def _read_rows_into_file(path: str, key: str, out_path: str, shape: Tuple[int, ...], r0: int, r1: int) -> None:
+    out = np.memmap(out_path, dtype=np.float32, mode="r+", shape=shape)
+    try:
+        with h5py.File(path, "r", rdcc_nbytes=_HDF5_RDCC_NBYTES) as f:
+            f[key].read_direct(out, source_sel=np.s_[r0:r1], dest_sel=np.s_[r0:r1])
+        out.flush()
+    finally:
+        del out
+
+
+def _read_hdf5_dataset_parallel(path: Path, key: str, ds: Any, workers: int) -> np.ndarray:
+    """
+    Read a chunked, filtered (compressed) dataset by chunk-aligned row ranges in worker
+    processes. h5py serializes all HDF5 calls behind one lock per process, so threads would
+    not decompress in parallel; each worker opens its own handle and writes its rows into
+    a file mapping owned by the parent. The returned array is that mapping (no second copy);
+    the file is unlinked once the workers are done.
+    """
+    shape = tuple(ds.shape)
+    n = shape[0]
+    rows_per_chunk = int(ds.chunks[0])
+    n_chunks = -(-n // rows_per_chunk)
+    step = rows_per_chunk * max(1, -(-n_chunks // (workers * 4)))
+    # tmpfs where available, so the mapping is plain shared memory rather than disk-backed.
+    tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    fd, out_path = tempfile.mkstemp(prefix="qopexp_hdf5_", suffix=".f32", dir=tmp_dir)
+    os.close(fd)
+    try:
+        out = np.memmap(out_path, dtype=np.float32, mode="w+", shape=shape)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = [
+                ex.submit(_read_rows_into_file, str(path), key, out_path, shape, r0, min(n, r0 + step))
+                for r0 in range(0, n, step)
+            ]
+            for fut in futs:
+                fut.result()
+        return np.asarray(out)
+    finally:
+        try:
+            os.unlink(out_path)
+        except OSError:  # e.g. Windows refuses to remove a file that is still mapped
+            logger.warning("Could not remove temporary file %s", out_path)
+
+
+def _read_hdf5_vectors(path: Path, base_key: str, query_key: str, *, workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
     if h5py is None:
         raise RuntimeError("h5py is not installed. Install with: pip install h5py")
 
-    with h5py.File(path, "r") as f:
+    with h5py.File(path, "r", rdcc_nbytes=_HDF5_RDCC_NBYTES) as f:
         if base_key not in f:
             raise KeyError(f"HDF5 base_key '{base_key}' not found in {path}. Available: {list(f.keys())}")
         if query_key not in f:
             raise KeyError(f"HDF5 query_key '{query_key}' not found in {path}. Available: {list(f.keys())}")
-        base = np.asarray(f[base_key], dtype=np.float32)
-        query = np.asarray(f[query_key], dtype=np.float32)
+        ds = f[base_key]
+        base = None
+        # Contiguous / unfiltered layouts are I/O-bound: a single read_direct is already optimal.
+        if workers > 1 and ds.chunks is not None and ds.compression is not None and ds.size * 4 >= _PARALLEL_READ_MIN_BYTES:
+            try:
+                base = _read_hdf5_dataset_parallel(path, base_key, ds, workers)
+            except BrokenProcessPool as e:
+                logger.warning("Parallel HDF5 read of %s:%s failed (%s); reading serially", path, base_key, e)
+        if base is None:
+            base = _read_hdf5_dataset_f32(ds)
+        query = _read_hdf5_dataset_f32(f[query_key])
     return base, query
 
 
@@ -103,7 +203,8 @@ class ANNHdf5DatasetAdapter:
         dim = int(vectors["dim"])
         metric = str(vectors["metric"])
 
-        base, query = _read_hdf5_vectors(h5_path, base_key=base_key, query_key=query_key)
+        read_workers = int(source.get("read_workers", 1))
+        base, query = _read_hdf5_vectors(h5_path, base_key=base_key, query_key=query_key, workers=read_workers)
         if base.shape[1] != dim:
             raise ValueError(f"base vectors dim mismatch: expected {dim}, got {base.shape[1]}")
         if query.shape[1] != dim:
@@ -112,8 +213,8 @@ class ANNHdf5DatasetAdapter:
         # Preprocess normalize
         norm_cfg = get_nested(params, "preprocessing.normalize", {"enabled": False})
         if bool(norm_cfg.get("enabled", False)):
-            base = _l2_normalize(base.astype(np.float64)).astype(np.float32)
-            query = _l2_normalize(query.astype(np.float64)).astype(np.float32)
+            base = _l2_normalize(base)
+            query = _l2_normalize(query)
 
         # Projection to 1D
         proj_cfg = get_nested(params, "preprocessing.projection", {"enabled": True, "method": "random_projection", "target_dim": 1})
@@ -127,20 +228,23 @@ class ANNHdf5DatasetAdapter:
         seed = int(proj_cfg.get("seed", 2025))
 
         if method == "random_projection":
-            proj0, vec = _random_projection_1d(base.astype(np.float64), seed=seed)
-            proj0_q, _ = _random_projection_1d(query.astype(np.float64), seed=seed)
+            proj0, vec = _random_projection_1d(base, seed=seed)
+            proj0_q = query @ vec  # same seeded direction; no need to redraw it
             proj_meta = {"method": "random_projection", "seed": seed, "w_norm": float(np.linalg.norm(vec))}
         elif method == "pca":
-            proj0, comp = _pca_first_component_1d(base.astype(np.float64), seed=seed)
-            proj0_q = (query.astype(np.float64) - query.astype(np.float64).mean(axis=0, keepdims=True)) @ comp
-            proj_meta = {"method": "pca_1d_power_iter", "seed": seed, "comp_norm": float(np.linalg.norm(comp))}
+            proj0, comp = _pca_first_component_1d(base, seed=seed)
+            proj0_q = query @ comp
+            proj0_q -= np.float32(query.mean(axis=0, dtype=np.float64).astype(np.float32) @ comp)
+            proj_meta = {"method": "pca_1d_randomized_svd", "seed": seed, "comp_norm": float(np.linalg.norm(comp))}
         else:
             raise ValueError(f"Unknown projection method: {method}")
 
-        # Clustered layout by proj_0
-        order = np.argsort(proj0, kind="mergesort")
-        base_sorted = base[order]
-        proj0_sorted = proj0[order]
+        # Clustered layout by proj_0 (qid is re-assigned after sorting, so stability is not needed)
+        order = np.argsort(proj0, kind="quicksort")
+        base_sorted = np.empty_like(base)
+        np.take(base, order, axis=0, out=base_sorted)
+        del base
+        proj0_sorted = np.take(proj0, order)
         qid = np.arange(base_sorted.shape[0], dtype=np.int64)
 
         # Subsets
@@ -149,7 +253,7 @@ class ANNHdf5DatasetAdapter:
 
         payload: Dict[str, Any] = {
             "dataset_name": name,
-            "storage_format": "npz",
+            "storage_format": "npy",
             "root_dir": str(h5_path.parent),
             "vector_dim": dim,
             "metric": metric,
@@ -192,42 +296,31 @@ class ANNHdf5DatasetAdapter:
         data_dir = ensure_dir(art_dir / "data")
 
         # Write full materialization (sorted base + proj_0 + qid + queries)
-        base_npz = data_dir / "base_sorted.npz"
-        query_npz = data_dir / "queries.npz"
-        if not base_npz.exists():
-            np.savez_compressed(
-                base_npz,
-                base=base_sorted,
-                proj_0=proj0_sorted.astype(np.float32),
-                qid=qid,
-            )
-        if not query_npz.exists():
-            np.savez_compressed(
-                query_npz,
-                query=query,
-                proj_0=proj0_q.astype(np.float32),
-            )
-
-        # Write subsets (prefix of sorted arrays)
+        # as one directory of uncompressed .npy files per array group (mmap-friendly)
+        _save_npy_dir(
+            data_dir / "base_sorted",
+            base=base_sorted,
+            proj_0=proj0_sorted,
+            qid=qid,
+        )
+        _save_npy_dir(
+            data_dir / "queries",
+            query=query,
+            proj_0=proj0_q,
+        )
+
+        # Subsets are prefixes of the sorted base: emit view descriptors over base_sorted
+        # (readers slice the memory-mapped arrays) instead of writing copies to disk.
         views = []
         for n in subset_sizes:
             n = int(n)
             if n <= 0 or n > base_sorted.shape[0]:
                 continue
-            fn = f"subset_{n}.npz"
-            p = data_dir / fn
-            if not p.exists():
-                np.savez_compressed(
-                    p,
-                    base=base_sorted[:n],
-                    proj_0=proj0_sorted[:n].astype(np.float32),
-                    qid=np.arange(n, dtype=np.int64),
-                )
-            views.append({"name": f"subset_{n}", "N": n, "path": f"data/{fn}"})
+            views.append({"name": f"subset_{n}", "N": n, "path": "data/base_sorted", "slice": [0, n]})
 
         # Update payload with file references and views
-        payload["base_path"] = "data/base_sorted.npz"
-        payload["query_path"] = "data/queries.npz"
+        payload["base_path"] = "data/base_sorted"
+        payload["query_path"] = "data/queries"
         payload["views"] = views
 
         self._rewrite_payload(env.manifest.artifact_id, payload)
@@ -7,9 +7,6 @@ from typing import Any, Dict, Callable
 from qopexp.io.artifact_store import ArtifactStore
 from qopexp.contracts.protocols import DatasetAdapter
 
-from .tpch_dbgen_adapter import TPCHDbgenDatasetAdapter
-from .ann_hdf5_adapter import ANNHdf5DatasetAdapter
-
 
 @dataclass
 class DatasetAdapterRegistry:
@@ -25,6 +22,10 @@ class DatasetAdapterRegistry:
 
         # Heuristic routing
         if "tpch" in name or (isinstance(params.get("generator", {}), dict) and params["generator"].get("type") == "tpch-dbgen"):
+            # Adapters are imported on first use so resolving one never loads the other's
+            # heavy dependencies (pyarrow/pandas for TPC-H, h5py/HDF5 for ANN).
+            from .tpch_dbgen_adapter import TPCHDbgenDatasetAdapter
+
             return TPCHDbgenDatasetAdapter(store=self.store)
 
         # HDF5 ANN datasets (SIFT/DEEP/ANN-benchmarks style)
@@ -32,6 +33,8 @@ class DatasetAdapterRegistry:
         source = params.get("source", {}) or {}
         local_path = str(source.get("local_path", "")).lower()
         if fmt == "hdf5" or local_path.endswith(".hdf5") or "sift" in name or "deep" in name:
+            from .ann_hdf5_adapter import ANNHdf5DatasetAdapter
+
             return ANNHdf5DatasetAdapter(store=self.store)
 
         raise ValueError(f"Unable to resolve DatasetAdapter for dataset config name={dataset_cfg.get('name')}")
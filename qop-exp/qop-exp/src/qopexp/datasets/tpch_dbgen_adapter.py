@@ -2,13 +2,30 @@
 from __future__ import annotations
 
 import os
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None
+    pacsv = None
+    pq = None
+
+try:
+    import duckdb  # type: ignore
+except Exception:  # pragma: no cover
+    duckdb = None
+
 from qopexp.contracts import ArtifactStage, ArtifactRef, CodeRef, ConfigRef
 from qopexp.io.artifact_store import ArtifactStore
 from qopexp.io.hashing import sha256_file
@@ -27,6 +44,202 @@ def _run_cmd(cmd: list[str], cwd: Optional[Path] = None) -> None:
         )
 
 
+def _run_dbgen_chunked(dbgen_path: Path, sf: float, tbl_dir: Path, chunks: int) -> None:
+    """
+    Runs `dbgen -C chunks -S i` for i = 1..chunks concurrently (each step is its own process,
+    the threads only wait on them), then concatenates every <table>.tbl.<i> in step order into
+    <table>.tbl. Steps cover contiguous key ranges, so the result matches a single dbgen run.
+    """
+    base_cmd = [str(dbgen_path), "-s", str(sf), "-f", "-C", str(chunks)]
+    with ThreadPoolExecutor(max_workers=chunks) as ex:
+        list(ex.map(lambda i: _run_cmd(base_cmd + ["-S", str(i)], cwd=tbl_dir), range(1, chunks + 1)))
+
+    for first in sorted(tbl_dir.glob("*.tbl.1")):
+        table_file = first.name[: -len(".1")]
+        parts = [p for p in (tbl_dir / f"{table_file}.{i}" for i in range(1, chunks + 1)) if p.exists()]
+        tmp = tbl_dir / f"{table_file}.tmp"
+        with open(tmp, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out, 16 << 20)
+        os.replace(tmp, tbl_dir / table_file)
+        for part in parts:
+            part.unlink()
+
+
+_LINEITEM_COLUMNS = [
+    "l_orderkey", "l_partkey", "l_suppkey", "l_linenumber",
+    "l_quantity", "l_extendedprice", "l_discount", "l_tax",
+    "l_returnflag", "l_linestatus", "l_shipdate", "l_commitdate",
+    "l_receiptdate", "l_shipinstruct", "l_shipmode", "l_comment",
+]
+_LINEITEM_DATE_COLUMNS = ["l_shipdate", "l_commitdate", "l_receiptdate"]
+_LINEITEM_PANDAS_DTYPES = {
+    "l_orderkey": "int64",
+    "l_partkey": "int64",
+    "l_suppkey": "int64",
+    "l_linenumber": "int64",
+    "l_quantity": "float64",
+    "l_extendedprice": "float64",
+    "l_discount": "float64",
+    "l_tax": "float64",
+    "l_returnflag": "string",
+    "l_linestatus": "string",
+    "l_shipinstruct": "string",
+    "l_shipmode": "string",
+    "l_comment": "string",
+}
+
+
+def _open_sequential(path: Path):
+    """
+    Unbuffered binary handle with a sequential-access hint, so the kernel uses a larger
+    readahead window for the single front-to-back scan. The hint is tied to this open file,
+    hence the parsers read through the returned handle rather than the path.
+    """
+    f = open(path, "rb", buffering=0)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # advisory only (e.g. unsupported on this filesystem)
+    return f
+
+
+def _lineitem_arrow_types() -> Dict[str, "pa.DataType"]:
+    col_types = {c: pa.string() if t == "string" else pa.from_numpy_dtype(t) for c, t in _LINEITEM_PANDAS_DTYPES.items()}
+    col_types.update({c: pa.timestamp("us") for c in _LINEITEM_DATE_COLUMNS})
+    return col_types
+
+
+def _lineitem_schema() -> "pa.Schema":
+    col_types = _lineitem_arrow_types()
+    return pa.schema([(c, col_types[c]) for c in _LINEITEM_COLUMNS])
+
+
+def _lineitem_csv_options() -> Dict[str, Any]:
+    # Multithreaded C++ tokenizer; dates are parsed during conversion, so no to_datetime pass.
+    col_types = _lineitem_arrow_types()
+    return dict(
+        read_options=pacsv.ReadOptions(column_names=_LINEITEM_COLUMNS + ["_trailing"], block_size=64 << 20),
+        parse_options=pacsv.ParseOptions(delimiter="|"),
+        convert_options=pacsv.ConvertOptions(
+            column_types=col_types,
+            include_columns=_LINEITEM_COLUMNS,
+            timestamp_parsers=["%Y-%m-%d"],
+        ),
+    )
+
+
+def _read_lineitem_table(path: Path) -> "pa.Table":
+    with _open_sequential(path) as f:
+        return pacsv.read_csv(f, **_lineitem_csv_options())
+
+
+# Rows per batch when streaming the externally sorted intermediate file (pyarrow's default
+# row group size, so unconfigured row groups come out the same as with write_table).
+_STREAM_BATCH_ROWS = 1 << 20
+
+_DUCKDB_TYPES = {"int64": "BIGINT", "float64": "DOUBLE", "string": "VARCHAR"}
+
+
+def _write_lineitem_batches(
+    batches,
+    schema: "pa.Schema",
+    parquet_path: Path,
+    *,
+    qid_col: str,
+    write_kwargs: Dict[str, Any],
+    count_shipdates: bool,
+) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+    """
+    Streams record batches into parquet_path, appending the ordinal id as a running offset.
+    Only one batch is resident at a time. With count_shipdates, returns the l_shipdate value
+    counts (see _shipdate_value_counts) instead of keeping the column for the stats.
+    """
+    writer_kwargs = dict(write_kwargs)
+    row_group_size = writer_kwargs.pop("row_group_size", None)
+    out_schema = schema.append(pa.field(qid_col, pa.int64()))
+    parts = []
+    offset = 0
+    with pq.ParquetWriter(parquet_path, out_schema, write_statistics=True, **writer_kwargs) as writer:
+        for batch in batches:
+            n = batch.num_rows
+            if n == 0:
+                continue
+            tbl = pa.Table.from_batches([batch]).cast(schema)
+            tbl = tbl.append_column(qid_col, pa.array(np.arange(offset, offset + n, dtype=np.int64)))
+            writer.write_table(tbl, row_group_size=row_group_size)
+            if count_shipdates:
+                parts.append(_shipdate_value_counts(tbl.column("l_shipdate").to_numpy()))
+            offset += n
+    if not count_shipdates:
+        return None
+    return _merge_value_counts(parts, offset)
+
+
+def _parquet_shipdate_counts(parquet_path: Path) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    l_shipdate value counts of an existing parquet file, read one batch at a time.
+    """
+    pf = pq.ParquetFile(parquet_path)
+    try:
+        parts = [
+            _shipdate_value_counts(batch.column(0).to_numpy(zero_copy_only=False))
+            for batch in pf.iter_batches(batch_size=_STREAM_BATCH_ROWS, columns=["l_shipdate"])
+        ]
+        n_rows = pf.metadata.num_rows
+    finally:
+        pf.close()
+    return _merge_value_counts(parts, n_rows)
+
+
+def _merge_value_counts(parts: list, n_rows: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    if not parts:
+        return np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.int64), n_rows
+    # Few distinct dates per batch, so merging the per-batch counts is cheap.
+    uniq, inv = np.unique(np.concatenate([u for u, _ in parts]), return_inverse=True)
+    counts = np.zeros(len(uniq), dtype=np.int64)
+    np.add.at(counts, inv.reshape(-1), np.concatenate([c for _, c in parts]))
+    return uniq, counts, n_rows
+
+
+def _shipdate_value_counts(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorted distinct non-NaT values and their counts; O(distinct dates) memory, not O(rows).
+    """
+    if np.isnat(values).any():
+        values = values[~np.isnat(values)]
+    return np.unique(values, return_counts=True)
+
+
+def _sort_lineitem_duckdb(path: Path, out_path: Path, order_col: str, ascending: bool, *, temp_dir: Path) -> None:
+    """
+    External (disk-spilling) sort of lineitem.tbl into an intermediate parquet file.
+    Ties are broken on (l_orderkey, l_linenumber), the order dbgen emits rows in, so the
+    result matches the stable in-memory sort and is deterministic across runs.
+    """
+    def lit(v: Any) -> str:
+        return "'" + str(v).replace("'", "''") + "'"
+
+    col_types = {c: _DUCKDB_TYPES[t] for c, t in _LINEITEM_PANDAS_DTYPES.items()}
+    col_types.update({c: "TIMESTAMP" for c in _LINEITEM_DATE_COLUMNS})
+    columns = ", ".join(f"{lit(c)}: {lit(col_types[c])}" for c in _LINEITEM_COLUMNS)
+    direction = "ASC" if ascending else "DESC"
+    con = duckdb.connect()
+    try:
+        con.execute(f"SET temp_directory = {lit(temp_dir)}")
+        con.execute(
+            f"COPY (SELECT {', '.join(_LINEITEM_COLUMNS)} "
+            f"FROM read_csv({lit(path)}, delim = '|', header = false, "
+            f"columns = {{{columns}, '_trailing': 'VARCHAR'}}, timestampformat = '%Y-%m-%d') "
+            f"ORDER BY {order_col} {direction}, l_orderkey, l_linenumber) "
+            f"TO {lit(out_path)} (FORMAT parquet)"
+        )
+    finally:
+        con.close()
+
+
 def _read_lineitem_tbl(path: Path) -> pd.DataFrame:
     """
     TPC-H .tbl is pipe-delimited with a trailing '|'.
@@ -35,41 +248,107 @@ def _read_lineitem_tbl(path: Path) -> pd.DataFrame:
       L_DISCOUNT, L_TAX, L_RETURNFLAG, L_LINESTATUS, L_SHIPDATE, L_COMMITDATE,
       L_RECEIPTDATE, L_SHIPINSTRUCT, L_SHIPMODE, L_COMMENT
     """
-    cols = [
-        "l_orderkey", "l_partkey", "l_suppkey", "l_linenumber",
-        "l_quantity", "l_extendedprice", "l_discount", "l_tax",
-        "l_returnflag", "l_linestatus", "l_shipdate", "l_commitdate",
-        "l_receiptdate", "l_shipinstruct", "l_shipmode", "l_comment",
-    ]
-    df = pd.read_csv(
-        path,
-        sep="|",
-        header=None,
-        names=cols + ["_trailing"],
-        engine="python",
-        dtype={
-            "l_orderkey": "int64",
-            "l_partkey": "int64",
-            "l_suppkey": "int64",
-            "l_linenumber": "int64",
-            "l_quantity": "float64",
-            "l_extendedprice": "float64",
-            "l_discount": "float64",
-            "l_tax": "float64",
-            "l_returnflag": "string",
-            "l_linestatus": "string",
-            "l_shipinstruct": "string",
-            "l_shipmode": "string",
-            "l_comment": "string",
-        },
-    )
-    df = df.drop(columns=["_trailing"])
+    if pacsv is not None:
+        # Same frame as the pandas path: nullable "string" columns, datetime64 dates.
+        return _read_lineitem_table(path).to_pandas(types_mapper={pa.string(): pd.StringDtype()}.get)
+
+    with _open_sequential(path) as f:
+        df = pd.read_csv(
+            f,
+            sep="|",
+            header=None,
+            names=_LINEITEM_COLUMNS + ["_trailing"],
+            usecols=_LINEITEM_COLUMNS,
+            engine="c",
+            dtype=_LINEITEM_PANDAS_DTYPES,
+        )
     # Parse dates
-    for c in ["l_shipdate", "l_commitdate", "l_receiptdate"]:
+    for c in _LINEITEM_DATE_COLUMNS:
         df[c] = pd.to_datetime(df[c], format="%Y-%m-%d", errors="raise")
     return df
 
 
+def _small_range_sort_indices(col: "pa.ChunkedArray", ascending: bool) -> Optional[np.ndarray]:
+    """
+    Stable sort permutation for a low-cardinality integer-like key (dates spanning a few
+    thousand days, small ints), computed as a 16-bit NumPy radix sort instead of a
+    comparison sort. Same order as Table.sort_by (ties keep input order). Returns None when
+    the column does not qualify (nulls, non-integral type, or too wide a range).
+    """
+    t = col.type
+    if col.null_count or not (pa.types.is_integer(t) or pa.types.is_timestamp(t) or pa.types.is_date(t)):
+        return None
+    if len(col) == 0:
+        return np.empty(0, dtype=np.int64)
+    keys = col.to_numpy()
+    if keys.dtype.kind == "M":
+        keys = keys.view("i8")
+        if pa.types.is_timestamp(t):
+            # Whole days only (as dbgen dates are); sub-day timestamps keep the generic sort.
+            day = np.timedelta64(1, "D") // np.timedelta64(1, t.unit)
+            if (keys % day).any():
+                return None
+            keys = keys // day
+    kmin = int(keys.min())
+    kmax = int(keys.max())
+    if kmax - kmin >= 1 << 16:
+        return None
+    offsets = (keys - kmin) if ascending else (kmax - keys)
+    return np.argsort(offsets.astype(np.uint16), kind="stable")
+
+
+def _datetime_percentiles(values: np.ndarray, percentiles: list[float]) -> Dict[str, str]:
+    """
+    Linear-interpolation quantiles of a datetime64 column, matching pandas' Series.quantile
+    (interpolate in the column's own unit, truncate, then cast to ns). The clustered column is
+    already sorted, so each quantile is an O(1) lookup instead of a pandas quantile pass.
+    """
+    if np.isnat(values).any():
+        values = values[~np.isnat(values)]
+    n = len(values)
+    if n == 0:
+        return {str(p): str(pd.NaT) for p in percentiles}
+    if n > 1 and not (values[1:] >= values[:-1]).all():
+        values = np.sort(values)
+    lo, hi, t = _percentile_positions(n, percentiles)
+    return _lerp_datetime(values[lo], values[hi], t, percentiles)
+
+
+def _datetime_percentiles_from_counts(
+    uniq: np.ndarray, counts: np.ndarray, percentiles: list[float]
+) -> Dict[str, str]:
+    """
+    Same result as _datetime_percentiles over the expanded column, from sorted distinct
+    values and their counts (the k-th smallest value is found on the cumulative counts).
+    """
+    cum = np.cumsum(counts)
+    n = int(cum[-1]) if len(cum) else 0
+    if n == 0:
+        return {str(p): str(pd.NaT) for p in percentiles}
+    lo, hi, t = _percentile_positions(n, percentiles)
+    a = uniq[np.searchsorted(cum, lo, side="right")]
+    b = uniq[np.searchsorted(cum, hi, side="right")]
+    return _lerp_datetime(a, b, t, percentiles)
+
+
+def _percentile_positions(n: int, percentiles: list[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    pos = np.asarray(percentiles, dtype=np.float64) * (n - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, n - 1)
+    return lo, hi, pos - lo
+
+
+def _lerp_datetime(lo_vals: np.ndarray, hi_vals: np.ndarray, t: np.ndarray, percentiles: list[float]) -> Dict[str, str]:
+    unit = np.datetime_data(lo_vals.dtype)[0]
+    a = lo_vals.view("i8").astype(np.float64)
+    b = hi_vals.view("i8").astype(np.float64)
+    d = b - a
+    # Same two-sided lerp as numpy's "linear" method.
+    q = np.where(t >= 0.5, b - d * (1 - t), a + d * t)
+    out = q.astype(np.int64).astype(f"datetime64[{unit}]").astype("datetime64[ns]")
+    return {str(p): str(pd.Timestamp(v)) for p, v in zip(percentiles, out)}
+
+
 @dataclass
 class TPCHDbgenDatasetAdapter:
     store: ArtifactStore
@@ -109,10 +388,15 @@ class TPCHDbgenDatasetAdapter:
                 raise FileNotFoundError(f"dbgen not found: {dbgen_path}. Set TPCH_DBGEN_PATH or params.generator.dbgen_path")
 
             # dbgen writes into current working directory.
-            # Use -s (scale), -f (force overwrite), -C/-S are for parallel chunks (not used here).
+            # Use -s (scale), -f (force overwrite); -C/-S split generation into parallel steps.
             # Some dbgen builds support -b for dists; keep minimal.
-            cmd = [str(dbgen_path), "-s", str(sf), "-f"]
-            _run_cmd(cmd, cwd=tbl_dir)
+            # Below SF 1 a single process finishes quickly, so chunking is opt-in there.
+            chunks = int(gen.get("chunks", (os.cpu_count() or 1) if sf >= 1 else 1))
+            if chunks > 1:
+                _run_dbgen_chunked(dbgen_path, sf, tbl_dir, chunks)
+            else:
+                cmd = [str(dbgen_path), "-s", str(sf), "-f"]
+                _run_cmd(cmd, cwd=tbl_dir)
 
             if not lineitem_tbl.exists():
                 raise RuntimeError(f"dbgen completed but lineitem.tbl not found at {lineitem_tbl}")
@@ -157,38 +441,117 @@ class TPCHDbgenDatasetAdapter:
         art_dir = self.store.paths.artifacts_root / ArtifactStage.DATASETS.value / env.manifest.artifact_id
         data_dir = ensure_dir(art_dir / "data")
 
+        stats_cfg = get_nested(params, "preprocessing.stats", {"enabled": True})
+        stats_enabled = bool(stats_cfg.get("enabled", True))
+        # l_shipdate kept from the write below so the stats need not re-read the parquet file.
+        # The streaming writers only keep its value counts, so their memory stays bounded.
+        shipdates: Optional[np.ndarray] = None
+        shipdate_counts: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+
         parquet_path = data_dir / "lineitem.parquet"
         if not parquet_path.exists():
-            df = _read_lineitem_tbl(lineitem_tbl)
-
             # Clustered layout on l_shipdate if enabled
             clustered = bool(get_nested(params, "preprocessing.clustered_layout.enabled", True))
             order_col = get_nested(params, "preprocessing.clustered_layout.order_by.0.column", "l_shipdate")
             direction = get_nested(params, "preprocessing.clustered_layout.order_by.0.direction", "asc")
             ascending = (str(direction).lower() != "desc")
+            if clustered and order_col not in _LINEITEM_COLUMNS:
+                raise ValueError(f"order_by column not found in lineitem: {order_col}")
 
-            if clustered:
-                if order_col not in df.columns:
-                    raise ValueError(f"order_by column not found in lineitem: {order_col}")
-                df = df.sort_values(by=[order_col], ascending=ascending).reset_index(drop=True)
-
-            # Add ordinal id
+            # Ordinal id column
             qid_col = get_nested(params, "preprocessing.clustered_layout.add_ordinal_id.column", "qid")
-            df[qid_col] = range(len(df))
 
-            df.to_parquet(parquet_path, index=False)
+            # Bounded row groups/pages with min/max statistics let scans on the clustered
+            # column prune row groups instead of decoding the whole file.
+            write_kwargs: Dict[str, Any] = {}
+            row_group_size = get_nested(params, "preprocessing.parquet.row_group_size", None)
+            if row_group_size:
+                write_kwargs["row_group_size"] = int(row_group_size)
+            data_page_size = get_nested(params, "preprocessing.parquet.data_page_size", None)
+            if data_page_size:
+                write_kwargs["data_page_size"] = int(data_page_size)
+            if clustered and pq is not None and hasattr(pq, "SortingColumn"):
+                # Record the clustering in the footer (pyarrow>=13 only).
+                write_kwargs["sorting_columns"] = [
+                    pq.SortingColumn(_LINEITEM_COLUMNS.index(order_col), descending=not ascending)
+                ]
+
+            if clustered and duckdb is not None and pq is not None:
+                # Out-of-core: DuckDB sorts with spilling, then the sorted file is streamed
+                # through the same writer so the output layout/options are unchanged.
+                sorted_tmp = data_dir / "lineitem.sorted.tmp.parquet"
+                spill_dir = ensure_dir(data_dir / ".sort_spill")
+                try:
+                    _sort_lineitem_duckdb(lineitem_tbl, sorted_tmp, order_col, ascending, temp_dir=spill_dir)
+                    pf = pq.ParquetFile(sorted_tmp)
+                    shipdate_counts = _write_lineitem_batches(
+                        pf.iter_batches(batch_size=_STREAM_BATCH_ROWS),
+                        _lineitem_schema(),
+                        parquet_path,
+                        qid_col=qid_col,
+                        write_kwargs=write_kwargs,
+                        count_shipdates=stats_enabled,
+                    )
+                    pf.close()
+                finally:
+                    sorted_tmp.unlink(missing_ok=True)
+                    shutil.rmtree(spill_dir, ignore_errors=True)
+            elif not clustered and pacsv is not None:
+                # No sort needed: stream CSV blocks straight into the parquet writer.
+                with _open_sequential(lineitem_tbl) as f:
+                    reader = pacsv.open_csv(f, **_lineitem_csv_options())
+                    shipdate_counts = _write_lineitem_batches(
+                        reader,
+                        _lineitem_schema(),
+                        parquet_path,
+                        qid_col=qid_col,
+                        write_kwargs=write_kwargs,
+                        count_shipdates=stats_enabled,
+                    )
+            elif pacsv is not None:
+                # Arrow-native: parse, sort and write without materializing a pandas frame.
+                tbl = _read_lineitem_table(lineitem_tbl)
+                if clustered:
+                    perm = _small_range_sort_indices(tbl.column(order_col), ascending)
+                    if perm is not None:
+                        tbl = tbl.take(perm)
+                    else:
+                        tbl = tbl.sort_by([(order_col, "ascending" if ascending else "descending")])
+                tbl = tbl.append_column(qid_col, pa.array(np.arange(tbl.num_rows, dtype=np.int64)))
+                pq.write_table(tbl, parquet_path, write_statistics=True, **write_kwargs)
+                if stats_enabled:
+                    shipdates = tbl.column("l_shipdate").to_numpy()
+                del tbl
+            else:
+                df = _read_lineitem_tbl(lineitem_tbl)
+                if clustered:
+                    df = df.sort_values(by=[order_col], ascending=ascending).reset_index(drop=True)
+                df[qid_col] = np.arange(len(df), dtype=np.int64)
+                df.to_parquet(parquet_path, index=False, write_statistics=True, **write_kwargs)
+                if stats_enabled:
+                    shipdates = df["l_shipdate"].to_numpy()
+                del df
 
         # Compute simple stats (percentiles/histogram) if requested
-        stats_cfg = get_nested(params, "preprocessing.stats", {"enabled": True})
-        if bool(stats_cfg.get("enabled", True)):
-            df_small = pd.read_parquet(parquet_path, columns=["l_shipdate"])
+        if stats_enabled:
             # percentiles used to derive selectivity cutoffs
             percentiles = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1]
-            pvals = df_small["l_shipdate"].quantile(percentiles).astype("datetime64[ns]").to_dict()
-            payload["stats"] = {
-                "l_shipdate_percentiles": {str(k): str(v) for k, v in pvals.items()},
-                "row_count": int(len(df_small)),
-            }
+            if shipdates is None and shipdate_counts is None and pq is not None:
+                # Existing parquet file: count l_shipdate batch by batch rather than loading it.
+                shipdate_counts = _parquet_shipdate_counts(parquet_path)
+            if shipdate_counts is not None:
+                uniq, counts, row_count = shipdate_counts
+                payload["stats"] = {
+                    "l_shipdate_percentiles": _datetime_percentiles_from_counts(uniq, counts, percentiles),
+                    "row_count": row_count,
+                }
+            else:
+                if shipdates is None:
+                    shipdates = pd.read_parquet(parquet_path, columns=["l_shipdate"])["l_shipdate"].to_numpy()
+                payload["stats"] = {
+                    "l_shipdate_percentiles": _datetime_percentiles(shipdates, percentiles),
+                    "row_count": int(len(shipdates)),
+                }
 
         # Update payload.json in-place (artifact immutability by convention; payload update is acceptable during build)
         # We keep it conservative: only add file references and stats.
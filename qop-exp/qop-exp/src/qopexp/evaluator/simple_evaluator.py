@@ -1,7 +1,7 @@
 # src/qopexp/evaluator/simple_evaluator.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -11,13 +11,14 @@ from qopexp.io.artifact_store import ArtifactStore
 
 from .utils import (
     expand_env_vars,
+    get_nested,
     require,
     safe_float,
     safe_int,
     counts_success_rate,
     abs_rel_error,
 )
-from .table_writer import write_csv
+from .table_writer import PARQUET_AVAILABLE, write_csv_columns, write_parquet_columns
 
 
 @dataclass
@@ -32,6 +33,8 @@ class SimpleEvaluator:
       - Compile metrics are retrieved by lineage: raw -> compiled -> compiled_circuits[*].metrics
     """
     store: ArtifactStore
+    # compiled artifact_id -> resolved lineage fields; artifacts are immutable.
+    _lineage_cache: Dict[str, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False)
 
     def evaluate(
         self,
@@ -51,110 +54,49 @@ class SimpleEvaluator:
         compiled_aid = self._find_upstream_artifact(raw, ArtifactStage.COMPILED)
         job_aid = self._find_upstream_artifact(raw, ArtifactStage.JOBS)
 
-        compiled = self.store.load(ArtifactStage.COMPILED, compiled_aid) if compiled_aid else None
+        lineage = self._resolve_lineage(compiled_aid) if compiled_aid else {}
+        compile_metrics_by_cid: Dict[str, Dict[str, Any]] = lineage.get("compile_metrics_by_cid", {})
+        circuit_aid: Optional[str] = lineage.get("circuit_aid")
+        kernel_name: str = lineage.get("kernel_name", "")
+        workload_name: str = lineage.get("workload_name", "")
+        dataset_name: str = lineage.get("dataset_name", "")
+        dim: Optional[int] = lineage.get("dim")
 
-        compile_metrics_by_cid: Dict[str, Dict[str, Any]] = {}
-        if compiled is not None:
-            for c in (compiled.payload.get("compiled_circuits") or []):
-                cid = str(c.get("circuit_id"))
-                m = c.get("metrics", {}) or {}
-                compile_metrics_by_cid[cid] = m
-
-        # Find circuit/workload/dataset via compiled->inputs
-        circuit_aid = None
-        if compiled is not None:
-            circuit_aid = self._find_upstream_artifact(compiled, ArtifactStage.CIRCUITS)
-
-        dataset_name = ""
-        workload_name = ""
-        kernel_name = ""
-        dim = None
-
-        if circuit_aid:
-            circuit = self.store.load(ArtifactStage.CIRCUITS, circuit_aid)
-            kernel_name = str(circuit.payload.get("kernel_name", ""))
-
-            workload_aid = self._find_upstream_artifact(circuit, ArtifactStage.WORKLOAD_INSTANCES)
-            if workload_aid:
-                workload = self.store.load(ArtifactStage.WORKLOAD_INSTANCES, workload_aid)
-                workload_name = str(workload.payload.get("workload_name", ""))
-
-                dataset_aid = self._find_upstream_artifact(workload, ArtifactStage.DATASETS)
-                if dataset_aid:
-                    dataset = self.store.load(ArtifactStage.DATASETS, dataset_aid)
-                    dataset_name = str(dataset.payload.get("dataset_name", ""))
-                    dim = safe_int(dataset.payload.get("vector_dim", None))
-
-        # Build curated rows
-        rows: List[Dict[str, Any]] = []
+        # Build the curated table column-wise: one preallocated list per column, filled by
+        # index; columns that are constant across quantum results are filled in one go.
         results = list((raw.payload.get("results") or []))
-        
-        def _baseline_rows(self, baseline_envs: List[Any], *, exp_name: str) -> List[Dict[str, Any]]:
-            rows: List[Dict[str, Any]] = []
-            for b in baseline_envs or []:
-                payload = b.payload or {}
-                for r in (payload.get("results") or []):
-                    tags = r.get("tags", {}) or {}
-                    meta = r.get("metadata", {}) or {}
-
-                    total = meta.get("walltime_sec_total", payload.get("walltime_sec_total", None))
-                    # preserve breakdown even if schema does not have dedicated columns yet:
-                    scan = meta.get("walltime_sec_scan", None)
-                    idx = meta.get("walltime_sec_index", None)
-                    ver = meta.get("walltime_sec_verify", None)
-                    post = meta.get("walltime_sec_post", None)
-
-                    rows.append(
-                        {
-                            "experiment_name": exp_name,
-                            "dataset_name": "",
-                            "workload_name": "",
-                            "kernel_name": "",
-                            "backend_name": "",
-
-                            "variant": "classical",
-
-                            "N": tags.get("N", None),
-                            "selectivity": r.get("p_true", None),
-                            "dim": tags.get("dim", None),
-                            "topk": tags.get("topk", None),
-
-                            "shots": None,
-                            "grover_iterations": None,
-                            "ae_k": None,
-
-                            "success_rate": r.get("p_hat", None),
-                            "abs_error": r.get("abs_error", None),
-                            "rel_error": r.get("rel_error", None),
-                            "confidence_level": None,
-                            "ci_low": None,
-                            "ci_high": None,
-
-                            "compile_depth": None,
-                            "compile_2q_gates": None,
-                            "compile_qubits": None,
-
-                            "walltime_sec_total": total,
-                            "walltime_sec_device": None,
-                            # temporarily carry breakdown into orchestration column; upgrade schema later if desired
-                            "walltime_sec_orchestration": total,
-
-                            "fallback_used": False,
-                            "failure_reason": "",
-                            "seed": tags.get("seed", None),
-                            "repeat_id": tags.get("repeat_id", None),
-
-                            # optional extra fields (ignored by CSV writer if not in schema)
-                            "_baseline_walltime_sec_scan": scan,
-                            "_baseline_walltime_sec_index": idx,
-                            "_baseline_walltime_sec_verify": ver,
-                            "_baseline_walltime_sec_post": post,
-                        }
-                    )
-            return rows
-        
-
-        for r in results:
+        n = len(results)
+        columns = CURATED_TABLE_SPEC_V1.columns
+        data: Dict[str, List[Any]] = {k: [None] * n for k in columns}
+        data["experiment_name"] = [exp_name] * n
+        data["dataset_name"] = [dataset_name] * n
+        data["workload_name"] = [workload_name] * n
+        data["backend_name"] = [backend_name] * n
+        data["dim"] = [dim] * n
+        col_kernel = data["kernel_name"]
+        col_variant = data["variant"]
+        col_N = data["N"]
+        col_sel = data["selectivity"]
+        col_topk = data["topk"]
+        col_shots = data["shots"]
+        col_grover = data["grover_iterations"]
+        col_ae_k = data["ae_k"]
+        col_success = data["success_rate"]
+        col_abs_err = data["abs_error"]
+        col_rel_err = data["rel_error"]
+        col_depth = data["compile_depth"]
+        col_2q = data["compile_2q_gates"]
+        col_qubits = data["compile_qubits"]
+        col_wall_total = data["walltime_sec_total"]
+        col_wall_dev = data["walltime_sec_device"]
+        col_wall_orch = data["walltime_sec_orchestration"]
+        col_fallback = data["fallback_used"]
+        col_failure = data["failure_reason"]
+        col_seed = data["seed"]
+        col_repeat = data["repeat_id"]
+
+        get_compile_metrics = compile_metrics_by_cid.get
+        for i, r in enumerate(results):
             cid = str(r.get("circuit_id", ""))
             shots = safe_int(r.get("shots", None)) or 0
             counts = r.get("counts", {}) or {}
@@ -171,17 +113,17 @@ class SimpleEvaluator:
             topk = safe_int(tags.get("topk", None))
 
             # Estimate p from counts
-            success_bit_index = safe_int(tags.get("flag_bit_index", None))
-            p_hat = counts_success_rate(
-                {str(k): int(v) for k, v in counts.items()},
-                shots,
-                success_bit_index=success_bit_index,
-            )
+            success_bit_index = safe_int(tags.get("flag_bit_index", None))
+            p_hat = counts_success_rate(
+                {str(k): int(v) for k, v in counts.items()},
+                shots,
+                success_bit_index=success_bit_index,
+            )
             p_true = sel
 
             ae, re = abs_rel_error(p_hat, p_true)
 
-            cm = compile_metrics_by_cid.get(cid, {})
+            cm = get_compile_metrics(cid, {})
             compile_qubits = safe_int(cm.get("compile_qubits", None))
             compile_2q = safe_int(cm.get("compile_2q_gates", None))
             compile_depth = safe_int(cm.get("compile_depth_est", None))
@@ -192,57 +134,46 @@ class SimpleEvaluator:
             wall_dev = safe_float(meta.get("walltime_sec_device", None))
             wall_orch = safe_float(meta.get("walltime_sec_orchestration", None))
 
-            rows.append(
-                {
-                    "experiment_name": exp_name,
-                    "dataset_name": dataset_name,
-                    "workload_name": workload_name,
-                    "kernel_name": kname,
-                    "backend_name": backend_name,
-                    "variant": variant,
-
-                    "N": N,
-                    "selectivity": sel,
-                    "dim": dim,
-                    "topk": topk,
-
-                    "shots": shots,
-                    "grover_iterations": grover_it,
-                    "ae_k": ae_k,
-
-                    "success_rate": p_hat,  # in this minimal model, success_rate equals p_hat
-                    "abs_error": ae,
-                    "rel_error": re,
-                    "confidence_level": None,
-                    "ci_low": None,
-                    "ci_high": None,
-
-                    "compile_depth": compile_depth,
-                    "compile_2q_gates": compile_2q,
-                    "compile_qubits": compile_qubits,
-                    "walltime_sec_total": wall_total,
-                    "walltime_sec_device": wall_dev,
-                    "walltime_sec_orchestration": wall_orch,
-
-                    "fallback_used": bool(meta.get("fallback_used", False)),
-                    "failure_reason": str(meta.get("failure_reason", "")) if meta.get("failure_reason") else "",
-                    "seed": safe_int(tags.get("seed", meta.get("seed", None))),
-                    "repeat_id": safe_int(tags.get("repeat_id", None)),
-                }
-            )
-                # Merge baselines if provided via ground_truth
+            col_kernel[i] = kname
+            col_variant[i] = variant
+            col_N[i] = N
+            col_sel[i] = sel
+            col_topk[i] = topk
+            col_shots[i] = shots
+            col_grover[i] = grover_it
+            col_ae_k[i] = ae_k
+            col_success[i] = p_hat  # in this minimal model, success_rate equals p_hat
+            col_abs_err[i] = ae
+            col_rel_err[i] = re
+            col_depth[i] = compile_depth
+            col_2q[i] = compile_2q
+            col_qubits[i] = compile_qubits
+            col_wall_total[i] = wall_total
+            col_wall_dev[i] = wall_dev
+            col_wall_orch[i] = wall_orch
+            col_fallback[i] = bool(meta.get("fallback_used", False))
+            col_failure[i] = str(meta.get("failure_reason", "")) if meta.get("failure_reason") else ""
+            col_seed[i] = safe_int(tags.get("seed", meta.get("seed", None)))
+            col_repeat[i] = safe_int(tags.get("repeat_id", None))
+
+        # Merge baselines if provided via ground_truth
         if isinstance(ground_truth, dict) and "baselines" in ground_truth:
             baseline_envs = list(ground_truth.get("baselines") or [])
-            rows.extend(self._baseline_rows(baseline_envs, exp_name=exp_name))
-
-        # Persist curated table under artifact dir
-        table_rel = "table.csv"
+            baseline_rows = self._baseline_rows(baseline_envs, exp_name=exp_name)
+            for k in columns:
+                data[k].extend([br.get(k) for br in baseline_rows])
+            n += len(baseline_rows)
+
+        # Persist curated table under artifact dir (Parquet unless configured or pyarrow missing)
+        table_format = str(get_nested(cfg, "policies.reporting.table_format", "parquet")).lower()
+        table_format = "csv" if table_format == "csv" or not PARQUET_AVAILABLE else "parquet"
+        table_rel = "table.parquet" if table_format == "parquet" else "table.csv"
         payload = {
-            "table_format": "csv",
+            "table_format": table_format,
             "table_path": table_rel,
             "schema_version": CURATED_TABLE_SPEC_V1.schema_version,
             "summary": {
-                "row_count": len(rows),
+                "row_count": n,
                 "backend_name": backend_name,
                 "dataset_name": dataset_name,
                 "workload_name": workload_name,
@@ -250,7 +181,7 @@ class SimpleEvaluator:
             },
         }
 
-        metrics = {"row_count": len(rows), "schema_version": CURATED_TABLE_SPEC_V1.schema_version}
+        metrics = {"row_count": n, "schema_version": CURATED_TABLE_SPEC_V1.schema_version}
 
         # Optional config ref if injected
         config_refs: List[ConfigRef] = []
@@ -286,14 +217,133 @@ class SimpleEvaluator:
             extra_manifest={"evaluator": "SimpleEvaluator"},
         )
 
-        # Write table.csv into curated artifact dir
+        # Write the curated table into the curated artifact dir
         art_dir = self.store.paths.artifacts_root / ArtifactStage.RESULTS_CURATED.value / env.manifest.artifact_id
         table_path = art_dir / table_rel
-        write_csv(table_path, rows=rows, columns=CURATED_TABLE_SPEC_V1.columns)
+        if table_format == "parquet":
+            write_parquet_columns(
+                table_path,
+                data,
+                columns=columns,
+                column_types=CURATED_TABLE_SPEC_V1.column_types,
+            )
+        else:
+            write_csv_columns(table_path, data, columns=columns)
 
         # Return reloaded envelope (optional consistency)
         return self.store.load(ArtifactStage.RESULTS_CURATED, env.manifest.artifact_id)
 
+    def _baseline_rows(self, baseline_envs: List[Any], *, exp_name: str) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for b in baseline_envs or []:
+            payload = b.payload or {}
+            for r in (payload.get("results") or []):
+                tags = r.get("tags", {}) or {}
+                meta = r.get("metadata", {}) or {}
+
+                total = meta.get("walltime_sec_total", payload.get("walltime_sec_total", None))
+                # preserve breakdown even if schema does not have dedicated columns yet:
+                scan = meta.get("walltime_sec_scan", None)
+                idx = meta.get("walltime_sec_index", None)
+                ver = meta.get("walltime_sec_verify", None)
+                post = meta.get("walltime_sec_post", None)
+
+                rows.append(
+                    {
+                        "experiment_name": exp_name,
+                        "dataset_name": "",
+                        "workload_name": "",
+                        "kernel_name": "",
+                        "backend_name": "",
+
+                        "variant": "classical",
+
+                        "N": tags.get("N", None),
+                        "selectivity": r.get("p_true", None),
+                        "dim": tags.get("dim", None),
+                        "topk": tags.get("topk", None),
+
+                        "shots": None,
+                        "grover_iterations": None,
+                        "ae_k": None,
+
+                        "success_rate": r.get("p_hat", None),
+                        "abs_error": r.get("abs_error", None),
+                        "rel_error": r.get("rel_error", None),
+                        "confidence_level": None,
+                        "ci_low": None,
+                        "ci_high": None,
+
+                        "compile_depth": None,
+                        "compile_2q_gates": None,
+                        "compile_qubits": None,
+
+                        "walltime_sec_total": total,
+                        "walltime_sec_device": None,
+                        # temporarily carry breakdown into orchestration column; upgrade schema later if desired
+                        "walltime_sec_orchestration": total,
+
+                        "fallback_used": False,
+                        "failure_reason": "",
+                        "seed": tags.get("seed", None),
+                        "repeat_id": tags.get("repeat_id", None),
+
+                        # optional extra fields (ignored by CSV writer if not in schema)
+                        "_baseline_walltime_sec_scan": scan,
+                        "_baseline_walltime_sec_index": idx,
+                        "_baseline_walltime_sec_verify": ver,
+                        "_baseline_walltime_sec_post": post,
+                    }
+                )
+        return rows
+
+    def _resolve_lineage(self, compiled_aid: str) -> Dict[str, Any]:
+        """
+        compiled -> circuits -> workload -> dataset, reduced to the fields evaluate() needs.
+        Cached per compiled artifact_id: artifacts are immutable, and every raw result of a
+        sweep over one compiled artifact would otherwise re-read the same four payloads.
+        """
+        lineage = self._lineage_cache.get(compiled_aid)
+        if lineage is not None:
+            return lineage
+
+        compiled = self.store.load(ArtifactStage.COMPILED, compiled_aid)
+        compile_metrics_by_cid: Dict[str, Dict[str, Any]] = {}
+        for c in (compiled.payload.get("compiled_circuits") or []):
+            cid = str(c.get("circuit_id"))
+            m = c.get("metrics", {}) or {}
+            compile_metrics_by_cid[cid] = m
+
+        lineage = {
+            "compile_metrics_by_cid": compile_metrics_by_cid,
+            "circuit_aid": None,
+            "kernel_name": "",
+            "workload_name": "",
+            "dataset_name": "",
+            "dim": None,
+        }
+
+        # Find circuit/workload/dataset via compiled->inputs
+        circuit_aid = self._find_upstream_artifact(compiled, ArtifactStage.CIRCUITS)
+        if circuit_aid:
+            lineage["circuit_aid"] = circuit_aid
+            circuit = self.store.load(ArtifactStage.CIRCUITS, circuit_aid)
+            lineage["kernel_name"] = str(circuit.payload.get("kernel_name", ""))
+
+            workload_aid = self._find_upstream_artifact(circuit, ArtifactStage.WORKLOAD_INSTANCES)
+            if workload_aid:
+                workload = self.store.load(ArtifactStage.WORKLOAD_INSTANCES, workload_aid)
+                lineage["workload_name"] = str(workload.payload.get("workload_name", ""))
+
+                dataset_aid = self._find_upstream_artifact(workload, ArtifactStage.DATASETS)
+                if dataset_aid:
+                    dataset = self.store.load(ArtifactStage.DATASETS, dataset_aid)
+                    lineage["dataset_name"] = str(dataset.payload.get("dataset_name", ""))
+                    lineage["dim"] = safe_int(dataset.payload.get("vector_dim", None))
+
+        self._lineage_cache[compiled_aid] = lineage
+        return lineage
+
     def _find_upstream_artifact(self, env, stage: ArtifactStage) -> Optional[str]:
         for ref in (env.manifest.inputs or []):
             if ref.stage == stage:
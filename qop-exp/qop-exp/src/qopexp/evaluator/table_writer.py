@@ -3,15 +3,84 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None
+    pq = None
 
-def write_csv(path: str | Path, rows: List[Dict[str, Any]], columns: List[str]) -> None:
+PARQUET_AVAILABLE = pq is not None
+
+
+def write_csv(path: str | Path, rows: List[Dict[str, Any]], columns: Sequence[str]) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as f:
+        # Plain writer over a row generator: no per-row dict, one C-level writerows loop.
+        # Missing keys and None both serialize as empty fields, as with DictWriter.
+        w = csv.writer(f)
+        w.writerow(columns)
+        w.writerows([r.get(k) for k in columns] for r in rows)
+
+
+def write_csv_columns(path: str | Path, data: Dict[str, List[Any]], columns: Sequence[str]) -> None:
+    """
+    Same output as write_csv, from per-column lists (all of equal length).
+    """
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            out = {k: r.get(k, None) for k in columns}
-            w.writerow(out)
+        w = csv.writer(f)
+        w.writerow(columns)
+        w.writerows(zip(*(data[k] for k in columns)))
+
+
+def _arrow_column(values: List[Any], type_name: Optional[str]) -> "pa.Array":
+    # Infer, then safe-cast to the schema type (no silent truncation such as 2.5 -> 2).
+    # Loosely-typed rows (e.g. baseline tags) keep the inferred type, or fall back to
+    # strings, rather than failing the whole table.
+    try:
+        arr = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError, OverflowError):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    if type_name is not None:
+        try:
+            return arr.cast(pa.type_for_alias(type_name))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, TypeError, ValueError):
+            pass
+    return arr
+
+
+def write_parquet(
+    path: str | Path,
+    rows: List[Dict[str, Any]],
+    columns: Sequence[str],
+    column_types: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Columnar curated table (zstd, dictionary-encoded, with statistics). Requires pyarrow.
+    """
+    data = {k: [r.get(k) for r in rows] for k in columns}
+    write_parquet_columns(path, data, columns, column_types)
+
+
+def write_parquet_columns(
+    path: str | Path,
+    data: Dict[str, List[Any]],
+    columns: Sequence[str],
+    column_types: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Same output as write_parquet, from per-column lists (all of equal length).
+    """
+    if pq is None:
+        raise RuntimeError("pyarrow is not installed. Install with: pip install pyarrow")
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    types = column_types or {}
+    arrays = [_arrow_column(data[k], types.get(k)) for k in columns]
+    tbl = pa.Table.from_arrays(arrays, names=list(columns))
+    pq.write_table(tbl, p, compression="zstd", use_dictionary=True, write_statistics=True)
@@ -5,21 +5,42 @@ import os
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 _ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
 
 
+def _env_repl(m: re.Match[str]) -> str:
+    return os.environ.get(m.group(1), m.group(0))
+
+
 def expand_env_vars(obj: Any) -> Any:
     if isinstance(obj, str):
-        def _repl(m: re.Match[str]) -> str:
-            k = m.group(1)
-            return os.environ.get(k, m.group(0))
-        return _ENV_PATTERN.sub(_repl, obj)
+        if "${" not in obj:
+            return obj
+        return _ENV_PATTERN.sub(_env_repl, obj)
 
+    # Containers are only copied when a child actually changed; a config subtree without
+    # any ${VAR} reference is returned as-is instead of being rebuilt level by level.
     if isinstance(obj, dict):
-        return {k: expand_env_vars(v) for k, v in obj.items()}
+        out = None
+        for k, v in obj.items():
+            nv = expand_env_vars(v)
+            if nv is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = nv
+        return obj if out is None else out
 
     if isinstance(obj, list):
-        return [expand_env_vars(x) for x in obj]
+        out_list = None
+        for i, x in enumerate(obj):
+            nx = expand_env_vars(x)
+            if nx is not x:
+                if out_list is None:
+                    out_list = list(obj)
+                out_list[i] = nx
+        return obj if out_list is None else out_list
 
     return obj
 
@@ -40,60 +61,102 @@ def get_nested(cfg: Dict[str, Any], path: str, default: Any = None) -> Any:
 
 
 def safe_float(x: Any) -> Optional[float]:
+    # Common cases first: None and exact floats skip the try/except machinery.
+    if x is None:
+        return None
+    if type(x) is float:
+        return x
     try:
-        if x is None:
-            return None
         return float(x)
     except Exception:
         return None
 
 
 def safe_int(x: Any) -> Optional[int]:
+    if x is None:
+        return None
+    if type(x) is int:
+        return x
     try:
-        if x is None:
-            return None
         return int(x)
     except Exception:
         return None
 
 
-def counts_success_rate(
-    counts: Dict[str, int],
-    shots: int,
-    *,
-    success_bit_index: Optional[int] = None,
-) -> Optional[float]:
-    """
-    Assumes a 1-bit outcome model: success = '1'.
-    For multi-bit outcomes, treat success as the specified bit (default: c[0] -> rightmost bit).
-    """
-    if shots <= 0:
-        return None
-
-    # Fast path for 1-bit counts
-    if all(str(k) in ("0", "1") for k in counts.keys()):
-        one = counts.get("1", 0)
-        return float(one) / float(shots)
-
-    idx = 0 if success_bit_index is None else int(success_bit_index)
-    ones = 0
-    total = 0
-    for k, v in counts.items():
-        s = str(k).strip().replace(" ", "")
-        if not s:
-            continue
-        count = int(v)
-        total += count
-        pos = len(s) - 1 - idx  # rightmost bit is c[0]
-        if pos < 0:
-            continue
-        if s[pos] == "1":
-            ones += count
-
-    denom = shots if shots > 0 else total
-    if denom <= 0:
-        return None
-    return float(ones) / float(denom)
+# Below this many outcomes the NumPy setup costs more than the Python loop saves.
+_VECTORIZE_MIN_KEYS = 64
+
+
+def _ones_at_bit_vectorized(counts: Dict[str, int], idx: int) -> Optional[int]:
+    """
+    Sum of counts whose bitstring has '1' at bit idx (c[0] = rightmost), in one NumPy pass
+    over the keys joined into a single byte buffer. Returns None when a key needs the scalar
+    loop's normalization (non-str, non-ASCII, or containing whitespace).
+    """
+    try:
+        buf = np.frombuffer("\n".join(counts.keys()).encode("ascii"), dtype=np.uint8)
+    except (TypeError, UnicodeEncodeError):
+        return None
+    # Bytes <= 0x20 cover every ASCII whitespace char; only the n-1 separators may appear.
+    seps = np.flatnonzero(buf <= 0x20)
+    if len(seps) != len(counts) - 1 or (len(seps) and (buf[seps] != 0x0A).any()):
+        return None
+    ends = np.append(seps, len(buf))
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = seps + 1
+    pos = ends - 1 - idx  # rightmost bit is c[0]
+    valid = pos >= starts
+    hit = valid & (buf[np.where(valid, pos, 0)] == 0x31)
+    vals = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    return int(vals[hit].sum())
+
+
+def counts_success_rate(
+    counts: Dict[str, int],
+    shots: int,
+    *,
+    success_bit_index: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Assumes a 1-bit outcome model: success = '1'.
+    For multi-bit outcomes, treat success as the specified bit (default: c[0] -> rightmost bit).
+    """
+    if shots <= 0:
+        return None
+
+    # Fast path for 1-bit counts
+    if all(str(k) in ("0", "1") for k in counts.keys()):
+        one = counts.get("1", 0)
+        return float(one) / float(shots)
+
+    idx = 0 if success_bit_index is None else int(success_bit_index)
+    if len(counts) >= _VECTORIZE_MIN_KEYS:
+        try:
+            ones_v = _ones_at_bit_vectorized(counts, idx)
+        except (TypeError, ValueError, OverflowError):
+            ones_v = None  # e.g. non-integer counts: int() in the loop below handles them
+        if ones_v is not None:
+            return float(ones_v) / float(shots)
+
+    ones = 0
+    total = 0
+    for k, v in counts.items():
+        s = str(k).strip().replace(" ", "")
+        if not s:
+            continue
+        count = int(v)
+        total += count
+        pos = len(s) - 1 - idx  # rightmost bit is c[0]
+        if pos < 0:
+            continue
+        if s[pos] == "1":
+            ones += count
+
+    denom = shots if shots > 0 else total
+    if denom <= 0:
+        return None
+    return float(ones) / float(denom)
 
 
 def abs_rel_error(p_hat: Optional[float], p_true: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
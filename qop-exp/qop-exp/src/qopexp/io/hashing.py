@@ -1,8 +1,11 @@
 # src/qopexp/io/hashing.py
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
+import mmap
+import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -14,10 +17,38 @@ def sha256_bytes(data: bytes) -> str:
 
 
 def sha256_file(path: str | Path) -> str:
-    p = Path(path)
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+    """
+    SHA-256 of a file's bytes. Results are cached per (path, mtime_ns, size), so the
+    same config file hashed by several pipeline stages is only read once.
+    """
+    p = os.path.abspath(os.fspath(path))
+    st = os.stat(p)
+    return _sha256_file_cached(p, st.st_mtime_ns, st.st_size)
+
+
+# Files below this are hashed from a single read; larger ones are mapped (Python 3.10 path).
+_SMALL_FILE_BYTES = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=256)
+def _sha256_file_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as f:
+        # Python 3.11+: the read/update loop runs in C with a reused buffer.
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        if size < _SMALL_FILE_BYTES:
+            h.update(f.read())
+            return h.hexdigest()
+        try:
+            # One update over the page-cache mapping: no per-chunk bytes objects or copies.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+            return h.hexdigest()
+        except (OSError, ValueError, BufferError):
+            f.seek(0)
+            h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
 
@@ -30,8 +61,54 @@ def canonical_json_bytes(obj: Any) -> bytes:
     - separators minimize whitespace
     - ensure_ascii=False for UTF-8 stable bytes
     """
-    s = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-    return s.encode("utf-8")
+    return _dumps_canonical(obj).encode("utf-8")
+
+
+def _dumps_canonical(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+# Lists longer than this are encoded in slices of this many items.
+_CANONICAL_SLICE_ITEMS = 4096
+
+
+def _has_long_list(obj: Any) -> bool:
+    """
+    True if obj is, or reaches through str-keyed dicts, a list longer than
+    _CANONICAL_SLICE_ITEMS; only such subtrees are worth streaming.
+    """
+    if isinstance(obj, dict):
+        return all(type(k) is str for k in obj) and any(_has_long_list(v) for v in obj.values())
+    return isinstance(obj, (list, tuple)) and len(obj) > _CANONICAL_SLICE_ITEMS
+
+
+def _update_canonical(h: Any, obj: Any) -> None:
+    """
+    Feeds exactly canonical_json_bytes(obj) into hasher h. Subtrees without a long list
+    are encoded in one call; dicts above long lists are walked in sorted-key order and
+    the long lists encoded in slices, so a large payload is never held as one full str
+    plus its UTF-8 copy.
+    """
+    if isinstance(obj, dict) and _has_long_list(obj):
+        h.update(b"{")
+        for i, k in enumerate(sorted(obj)):
+            if i:
+                h.update(b",")
+            h.update(_dumps_canonical(k).encode("utf-8"))
+            h.update(b":")
+            _update_canonical(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)) and len(obj) > _CANONICAL_SLICE_ITEMS:
+        n = _CANONICAL_SLICE_ITEMS
+        h.update(b"[")
+        for start in range(0, len(obj), n):
+            if start:
+                h.update(b",")
+            # "[a,b,...]" minus the brackets; slices are non-empty.
+            h.update(_dumps_canonical(list(obj[start:start + n]))[1:-1].encode("utf-8"))
+        h.update(b"]")
+    else:
+        h.update(_dumps_canonical(obj).encode("utf-8"))
 
 
 def compute_artifact_id(
@@ -67,4 +144,6 @@ def compute_artifact_id(
         "payload": payload,
         "metrics": metrics or {},
     }
-    return sha256_bytes(canonical_json_bytes(obj))
+    h = hashlib.sha256()
+    _update_canonical(h, obj)
+    return h.hexdigest()
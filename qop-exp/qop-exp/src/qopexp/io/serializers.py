@@ -10,9 +10,24 @@ try:
 except Exception:  # pragma: no cover
     yaml = None
 
+# libyaml-backed loader when PyYAML was built with it; same documents, C scanner/parser.
+_YAML_SAFE_LOADER = None if yaml is None else getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 
 def read_json(path: Union[str, Path]) -> Dict[str, Any]:
     p = Path(path)
+    if orjson is not None:
+        data = p.read_bytes()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity written by write_json are not strict JSON; stdlib accepts them.
+            return json.loads(data.decode("utf-8"))
     with p.open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -29,7 +44,7 @@ def read_yaml(path: Union[str, Path]) -> Dict[str, Any]:
         raise RuntimeError("PyYAML is not installed. Install with: pip install pyyaml")
     p = Path(path)
     with p.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YAML_SAFE_LOADER)
     if data is None:
         return {}
     if not isinstance(data, dict):
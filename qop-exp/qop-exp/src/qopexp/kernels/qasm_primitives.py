@@ -1,6 +1,7 @@
 # src/qopexp/kernels/qasm_primitives.py
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import List, Tuple
 
@@ -24,12 +25,20 @@ class QRegLayout:
         return len(self.index)
 
 
-def _inv(lines: List[str], q: str, qubits: List[int]) -> None:
+def _qubit_refs(q: str, total: int) -> List[str]:
+    """
+    Operand strings "q[0]" .. "q[total-1]", formatted once per circuit. The gate emitters
+    below take this table (Q) and concatenate entries instead of formatting per gate.
+    """
+    return [f"{q}[{i}]" for i in range(total)]
+
+
+def _inv(lines: List[str], Q: List[str], qubits: List[int]) -> None:
     for qb in qubits:
-        lines.append(f"x {q}[{qb}];")
+        lines.append("x " + Q[qb] + ";")
 
 
-def mcx_ladder(lines: List[str], q: str, controls: List[int], target: int, work: List[int]) -> None:
+def mcx_ladder(lines: List[str], Q: List[str], controls: List[int], target: int, work: List[int]) -> None:
     """
     Multi-controlled X using a ladder of CCX gates.
     Requires:
@@ -45,13 +54,13 @@ def mcx_ladder(lines: List[str], q: str, controls: List[int], target: int, work:
     """
     k = len(controls)
     if k == 0:
-        lines.append(f"x {q}[{target}];")
+        lines.append("x " + Q[target] + ";")
         return
     if k == 1:
-        lines.append(f"cx {q}[{controls[0]}],{q}[{target}];")
+        lines.append("cx " + Q[controls[0]] + "," + Q[target] + ";")
         return
     if k == 2:
-        lines.append(f"ccx {q}[{controls[0]}],{q}[{controls[1]}],{q}[{target}];")
+        lines.append("ccx " + Q[controls[0]] + "," + Q[controls[1]] + "," + Q[target] + ";")
         return
 
     need = k - 2
@@ -59,20 +68,20 @@ def mcx_ladder(lines: List[str], q: str, controls: List[int], target: int, work:
         raise ValueError(f"mcx_ladder needs {need} work qubits for {k} controls, got {len(work)}")
 
     # compute ladder
-    lines.append(f"ccx {q}[{controls[0]}],{q}[{controls[1]}],{q}[{work[0]}];")
+    lines.append("ccx " + Q[controls[0]] + "," + Q[controls[1]] + "," + Q[work[0]] + ";")
     for i in range(2, k - 1):
-        lines.append(f"ccx {q}[{controls[i]}],{q}[{work[i-2]}],{q}[{work[i-1]}];")
+        lines.append("ccx " + Q[controls[i]] + "," + Q[work[i-2]] + "," + Q[work[i-1]] + ";")
     # last step into target
-    lines.append(f"ccx {q}[{controls[k-1]}],{q}[{work[need-1]}],{q}[{target}];")
+    lines.append("ccx " + Q[controls[k-1]] + "," + Q[work[need-1]] + "," + Q[target] + ";")
     # uncompute ladder
     for i in range(k - 2, 1, -1):
-        lines.append(f"ccx {q}[{controls[i]}],{q}[{work[i-2]}],{q}[{work[i-1]}];")
-    lines.append(f"ccx {q}[{controls[0]}],{q}[{controls[1]}],{q}[{work[0]}];")
+        lines.append("ccx " + Q[controls[i]] + "," + Q[work[i-2]] + "," + Q[work[i-1]] + ";")
+    lines.append("ccx " + Q[controls[0]] + "," + Q[controls[1]] + "," + Q[work[0]] + ";")
 
 
 def mark_less_than_constant_disjoint_terms(
     lines: List[str],
-    q: str,
+    Q: List[str],
     index: List[int],
     flag: int,
     C: int,
@@ -104,42 +113,33 @@ def mark_less_than_constant_disjoint_terms(
     maxC = 1 << n
     if C >= maxC:
         # x < 2^n is always true: just flip flag once
-        lines.append(f"x {q}[{flag}];")
+        lines.append("x " + Q[flag] + ";")
         return
 
-    # bits list MSB..LSB
-    bits = [(C >> i) & 1 for i in range(n)]  # LSB..MSB
+    # Higher bits j>i fixed to c_j, kept as running MSB-first prefixes so each term only
+    # adds bit i instead of rescanning every higher bit.
+    higher: List[int] = []
+    higher_zero: List[int] = []
     # iterate MSB->LSB
     for i in range(n - 1, -1, -1):
-        if bits[i] != 1:
-            continue
-
-        controls: List[int] = []
-        zero_controls: List[int] = []
-
-        # higher bits j>i fixed to bits[j]
-        for j in range(n - 1, i, -1):
-            qb = index[j]
-            if bits[j] == 1:
-                controls.append(qb)
-            else:
-                controls.append(qb)
-                zero_controls.append(qb)
-
-        # bit i fixed to 0
         qb_i = index[i]
-        controls.append(qb_i)
-        zero_controls.append(qb_i)
+        if (C >> i) & 1:
+            # bit i fixed to 0
+            controls = higher + [qb_i]
+            zero_controls = higher_zero + [qb_i]
 
-        # Convert 0-controls to 1-controls
-        _inv(lines, q, zero_controls)
-        mcx_ladder(lines, q, controls, flag, work)
-        _inv(lines, q, zero_controls)
+            # Convert 0-controls to 1-controls
+            _inv(lines, Q, zero_controls)
+            mcx_ladder(lines, Q, controls, flag, work)
+            _inv(lines, Q, zero_controls)
+        else:
+            higher_zero.append(qb_i)
+        higher.append(qb_i)
 
 
 def mark_range_lo_hi(
     lines: List[str],
-    q: str,
+    Q: List[str],
     index: List[int],
     flag_out: int,
     tmp_hi: int,
@@ -158,19 +158,19 @@ def mark_range_lo_hi(
     All flags are assumed initialized to |0>.
     """
     # tmp_hi = (x < hi)
-    mark_less_than_constant_disjoint_terms(lines, q, index, tmp_hi, hi, work)
+    mark_less_than_constant_disjoint_terms(lines, Q, index, tmp_hi, hi, work)
     # tmp_lo = (x < lo)
-    mark_less_than_constant_disjoint_terms(lines, q, index, tmp_lo, lo, work)
+    mark_less_than_constant_disjoint_terms(lines, Q, index, tmp_lo, lo, work)
 
     # flag_out = tmp_hi AND (~tmp_lo)
-    lines.append(f"x {q}[{tmp_lo}];")
-    lines.append(f"ccx {q}[{tmp_hi}],{q}[{tmp_lo}],{q}[{flag_out}];")
-    lines.append(f"x {q}[{tmp_lo}];")
+    lines.append("x " + Q[tmp_lo] + ";")
+    lines.append("ccx " + Q[tmp_hi] + "," + Q[tmp_lo] + "," + Q[flag_out] + ";")
+    lines.append("x " + Q[tmp_lo] + ";")
 
 
 def uncompute_range_lo_hi(
     lines: List[str],
-    q: str,
+    Q: List[str],
     index: List[int],
     flag_out: int,
     tmp_hi: int,
@@ -182,18 +182,18 @@ def uncompute_range_lo_hi(
     """
     Reverse of mark_range_lo_hi, assuming we want to reset flags to |0>.
     """
-    lines.append(f"x {q}[{tmp_lo}];")
-    lines.append(f"ccx {q}[{tmp_hi}],{q}[{tmp_lo}],{q}[{flag_out}];")
-    lines.append(f"x {q}[{tmp_lo}];")
+    lines.append("x " + Q[tmp_lo] + ";")
+    lines.append("ccx " + Q[tmp_hi] + "," + Q[tmp_lo] + "," + Q[flag_out] + ";")
+    lines.append("x " + Q[tmp_lo] + ";")
 
     # uncompute tmp_lo and tmp_hi by re-applying the same XOR-term constructions
-    mark_less_than_constant_disjoint_terms(lines, q, index, tmp_lo, lo, work)
-    mark_less_than_constant_disjoint_terms(lines, q, index, tmp_hi, hi, work)
+    mark_less_than_constant_disjoint_terms(lines, Q, index, tmp_lo, lo, work)
+    mark_less_than_constant_disjoint_terms(lines, Q, index, tmp_hi, hi, work)
 
 
 def phase_oracle_qfilter(
     lines: List[str],
-    q: str,
+    Q: List[str],
     index: List[int],
     flag_range: int,
     tmp_hi: int,
@@ -209,18 +209,18 @@ def phase_oracle_qfilter(
     """
     if pred_type == "qid_lt":
         # Interpret as x < hi; use tmp_hi as the only flag and alias flag_range
-        mark_less_than_constant_disjoint_terms(lines, q, index, flag_range, hi, work)
-        lines.append(f"z {q}[{flag_range}];")
-        mark_less_than_constant_disjoint_terms(lines, q, index, flag_range, hi, work)
+        mark_less_than_constant_disjoint_terms(lines, Q, index, flag_range, hi, work)
+        lines.append("z " + Q[flag_range] + ";")
+        mark_less_than_constant_disjoint_terms(lines, Q, index, flag_range, hi, work)
         return
 
     # default: range predicate
-    mark_range_lo_hi(lines, q, index, flag_range, tmp_hi, tmp_lo, lo, hi, work)
-    lines.append(f"z {q}[{flag_range}];")
-    uncompute_range_lo_hi(lines, q, index, flag_range, tmp_hi, tmp_lo, lo, hi, work)
+    mark_range_lo_hi(lines, Q, index, flag_range, tmp_hi, tmp_lo, lo, hi, work)
+    lines.append("z " + Q[flag_range] + ";")
+    uncompute_range_lo_hi(lines, Q, index, flag_range, tmp_hi, tmp_lo, lo, hi, work)
 
 
-def diffusion_about_uniform(lines: List[str], q: str, index: List[int], work: List[int]) -> None:
+def diffusion_about_uniform(lines: List[str], Q: List[str], index: List[int], work: List[int]) -> None:
     """
     Standard diffusion over uniform superposition on index register:
       H^n X^n (I - 2|0><0|) X^n H^n
@@ -234,34 +234,34 @@ def diffusion_about_uniform(lines: List[str], q: str, index: List[int], work: Li
     """
     n = len(index)
     for qb in index:
-        lines.append(f"h {q}[{qb}];")
+        lines.append("h " + Q[qb] + ";")
     for qb in index:
-        lines.append(f"x {q}[{qb}];")
+        lines.append("x " + Q[qb] + ";")
 
     if n == 1:
         # For 1 qubit diffusion is just Z in the middle
-        lines.append(f"z {q}[{index[0]}];")
+        lines.append("z " + Q[index[0]] + ";")
     else:
         target = index[0]
         controls = index[1:]  # control on other bits being 1
-        lines.append(f"h {q}[{target}];")
-        mcx_ladder(lines, q, controls, target, work)
-        lines.append(f"h {q}[{target}];")
+        lines.append("h " + Q[target] + ";")
+        mcx_ladder(lines, Q, controls, target, work)
+        lines.append("h " + Q[target] + ";")
 
     for qb in index:
-        lines.append(f"x {q}[{qb}];")
+        lines.append("x " + Q[qb] + ";")
     for qb in index:
-        lines.append(f"h {q}[{qb}];")
+        lines.append("h " + Q[qb] + ";")
 
 
-def prepare_uniform(lines: List[str], q: str, index: List[int]) -> None:
+def prepare_uniform(lines: List[str], Q: List[str], index: List[int]) -> None:
     for qb in index:
-        lines.append(f"h {q}[{qb}];")
+        lines.append("h " + Q[qb] + ";")
 
 
 def final_compute_and_measure_flag(
     lines: List[str],
-    q: str,
+    Q: List[str],
     index: List[int],
     flag_out: int,
     tmp_hi: int,
@@ -276,12 +276,56 @@ def final_compute_and_measure_flag(
     This preserves the 1-bit measurement model used by your current evaluator/sim.
     """
     if pred_type == "qid_lt":
-        mark_less_than_constant_disjoint_terms(lines, q, index, flag_out, hi, work)
-        lines.append(f"measure {q}[{flag_out}] -> c[0];")
+        mark_less_than_constant_disjoint_terms(lines, Q, index, flag_out, hi, work)
+        lines.append("measure " + Q[flag_out] + " -> c[0];")
         return
 
-    mark_range_lo_hi(lines, q, index, flag_out, tmp_hi, tmp_lo, lo, hi, work)
-    lines.append(f"measure {q}[{flag_out}] -> c[0];")
+    mark_range_lo_hi(lines, Q, index, flag_out, tmp_hi, tmp_lo, lo, hi, work)
+    lines.append("measure " + Q[flag_out] + " -> c[0];")
+
+
+def _text(lines: List[str]) -> str:
+    # Each line newline-terminated, so parts can be concatenated directly.
+    if not lines:
+        return ""
+    lines.append("")
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=128)
+def _grover_parts(n_index: int, pred_type: str, lo: int, hi: int, flags_count: int) -> Tuple[int, str, str, str]:
+    """
+    (total qubits, state prep, one oracle+diffusion iteration, final compute+measure) as
+    QASM text. These depend only on the predicate and layout, not on the iteration count,
+    so a sweep over iterations / MLAE k generates them once.
+    """
+    q = "q"
+    work_n = max(0, n_index - 2)
+    total = n_index + flags_count + work_n
+    Q = _qubit_refs(q, total)
+
+    index = list(range(0, n_index))
+    flags = list(range(n_index, n_index + flags_count))
+    work = list(range(n_index + flags_count, total))
+
+    flag_range = flags[0]
+    tmp_hi = flags[1] if flags_count >= 2 else flags[0]
+    tmp_lo = flags[2] if flags_count >= 3 else flags[0]
+
+    # A: uniform superposition
+    prep: List[str] = []
+    prepare_uniform(prep, Q, index)
+
+    # Grover iteration: Sf + diffusion
+    block: List[str] = []
+    phase_oracle_qfilter(block, Q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
+    diffusion_about_uniform(block, Q, index, work)
+
+    # Final compute predicate into flag_range and measure it (1-bit output)
+    tail: List[str] = []
+    final_compute_and_measure_flag(tail, Q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
+
+    return total, _text(prep), _text(block), _text(tail)
 
 
 def build_qasm2_grover_qfilter(
@@ -303,37 +347,14 @@ def build_qasm2_grover_qfilter(
     Total qubits = n_index + flags_count + max(0, n_index-2) = 2*n_index + flags_count - 2.
     For n_index=18, flags_count=3 => 37 qubits (safe under 72).
     """
-    q = "q"
-    work_n = max(0, n_index - 2)
-    total = n_index + flags_count + work_n
-
-    index = list(range(0, n_index))
-    flags = list(range(n_index, n_index + flags_count))
-    work = list(range(n_index + flags_count, total))
-
-    flag_range = flags[0]
-    tmp_hi = flags[1] if flags_count >= 2 else flags[0]
-    tmp_lo = flags[2] if flags_count >= 3 else flags[0]
-
-    lines: List[str] = [
+    total, prep, block, tail = _grover_parts(n_index, pred_type, lo, hi, flags_count)
+    head = _text([
         qasm2_header(),
-        f"qreg {q}[{total}];",
+        f"qreg q[{total}];",
         "creg c[1];",
         f"// kernel=grover_qfilter n_index={n_index} iters={iterations} pred={pred_type} lo={lo} hi={hi}",
-    ]
-
-    # A: uniform superposition
-    prepare_uniform(lines, q, index)
-
-    # Grover iterations: Sf + diffusion
-    for _ in range(max(0, int(iterations))):
-        phase_oracle_qfilter(lines, q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
-        diffusion_about_uniform(lines, q, index, work)
-
-    # Final compute predicate into flag_range and measure it (1-bit output)
-    final_compute_and_measure_flag(lines, q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
-
-    return "\n".join(lines) + "\n"
+    ])
+    return "".join((head, prep, block * max(0, int(iterations)), tail))
 
 
 def build_qasm2_mlae_schedule_element(
@@ -353,31 +374,11 @@ def build_qasm2_mlae_schedule_element(
 
     This produces the measurement statistics needed by classical MLE aggregation.
     """
-    q = "q"
-    work_n = max(0, n_index - 2)
-    total = n_index + flags_count + work_n
-
-    index = list(range(0, n_index))
-    flags = list(range(n_index, n_index + flags_count))
-    work = list(range(n_index + flags_count, total))
-
-    flag_range = flags[0]
-    tmp_hi = flags[1] if flags_count >= 2 else flags[0]
-    tmp_lo = flags[2] if flags_count >= 3 else flags[0]
-
-    lines: List[str] = [
+    total, prep, block, tail = _grover_parts(n_index, pred_type, lo, hi, flags_count)
+    head = _text([
         qasm2_header(),
-        f"qreg {q}[{total}];",
+        f"qreg q[{total}];",
         "creg c[1];",
         f"// kernel=mlae_selectivity n_index={n_index} k={k} pred={pred_type} lo={lo} hi={hi}",
-    ]
-
-    prepare_uniform(lines, q, index)
-
-    reps = max(0, int(k))
-    for _ in range(reps):
-        phase_oracle_qfilter(lines, q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
-        diffusion_about_uniform(lines, q, index, work)
-
-    final_compute_and_measure_flag(lines, q, index, flag_range, tmp_hi, tmp_lo, pred_type, lo, hi, work)
-    return "\n".join(lines) + "\n"
+    ])
+    return "".join((head, prep, block * max(0, int(k)), tail))
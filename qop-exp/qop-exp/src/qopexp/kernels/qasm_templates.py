@@ -27,38 +27,41 @@ def placeholder_grover_qasm2(index_qubits: int, ancilla_qubits: int, iterations:
     # Synthetic oracle+diffusion
     # Oracle placeholder: a chain of controlled-Z like patterns (implemented via cx+rz+cx)
     # Diffusion placeholder: h...x...h on index register with an mcx-like approximation via ancilla usage.
-    for it in range(max(0, iterations)):
-        # "Oracle" placeholder
-        if index_qubits >= 2:
-            for i in range(index_qubits - 1):
-                a = i
-                b = i + 1
-                lines.append(f"cx {q}[{a}],{q}[{b}];")
-                lines.append(f"rz(0.3141592653) {q}[{b}];")
-                lines.append(f"cx {q}[{a}],{q}[{b}];")
-        else:
-            lines.append(f"rz(0.3141592653) {q}[0];")
-
-        # "Diffusion" placeholder (approx)
-        for i in range(index_qubits):
-            lines.append(f"h {q}[{i}];")
-            lines.append(f"x {q}[{i}];")
-
-        # Use one ancilla if available to create a multi-qubit-dependent phase kick (placeholder)
-        if ancilla_qubits > 0 and index_qubits > 0:
-            anc = index_qubits  # first ancilla
-            ctrl = 0
-            lines.append(f"cx {q}[{ctrl}],{q}[{anc}];")
-            lines.append(f"rz(0.6283185307) {q}[{anc}];")
-            lines.append(f"cx {q}[{ctrl}],{q}[{anc}];")
-
-        for i in range(index_qubits):
-            lines.append(f"x {q}[{i}];")
-            lines.append(f"h {q}[{i}];")
+    # Every iteration emits the same gates: build the block once and repeat it.
+    block: List[str] = []
+    # "Oracle" placeholder
+    if index_qubits >= 2:
+        for i in range(index_qubits - 1):
+            a = i
+            b = i + 1
+            block.append(f"cx {q}[{a}],{q}[{b}];")
+            block.append(f"rz(0.3141592653) {q}[{b}];")
+            block.append(f"cx {q}[{a}],{q}[{b}];")
+    else:
+        block.append(f"rz(0.3141592653) {q}[0];")
+
+    # "Diffusion" placeholder (approx)
+    for i in range(index_qubits):
+        block.append(f"h {q}[{i}];")
+        block.append(f"x {q}[{i}];")
+
+    # Use one ancilla if available to create a multi-qubit-dependent phase kick (placeholder)
+    if ancilla_qubits > 0 and index_qubits > 0:
+        anc = index_qubits  # first ancilla
+        ctrl = 0
+        block.append(f"cx {q}[{ctrl}],{q}[{anc}];")
+        block.append(f"rz(0.6283185307) {q}[{anc}];")
+        block.append(f"cx {q}[{ctrl}],{q}[{anc}];")
+
+    for i in range(index_qubits):
+        block.append(f"x {q}[{i}];")
+        block.append(f"h {q}[{i}];")
+    lines.extend(block * max(0, iterations))
 
     # One measurement just to make it "complete"
     lines.append(f"measure {q}[0] -> c[0];")
-    return "\n".join(lines) + "\n"
+    lines.append("")
+    return "\n".join(lines)
 
 
 def placeholder_ae_qasm2(index_qubits: int, ancilla_qubits: int, k: int) -> str:
@@ -79,20 +82,22 @@ def placeholder_ae_qasm2(index_qubits: int, ancilla_qubits: int, k: int) -> str:
 
     # Synthetic "Q" repeated k times (k=0 still yields a valid circuit)
     reps = max(0, int(k))
-    for _ in range(reps):
-        # Use a small entangling pattern to represent Q
-        if index_qubits >= 2:
-            lines.append(f"cx {q}[0],{q}[1];")
-            lines.append(f"rz(0.3141592653) {q}[1];")
-            lines.append(f"cx {q}[0],{q}[1];")
-        else:
-            lines.append(f"rz(0.3141592653) {q}[0];")
-
-        if ancilla_qubits > 0 and index_qubits > 0:
-            anc = index_qubits
-            lines.append(f"cx {q}[0],{q}[{anc}];")
-            lines.append(f"rz(0.1570796327) {q}[{anc}];")
-            lines.append(f"cx {q}[0],{q}[{anc}];")
+    # Use a small entangling pattern to represent Q (built once, repeated reps times)
+    block: List[str] = []
+    if index_qubits >= 2:
+        block.append(f"cx {q}[0],{q}[1];")
+        block.append(f"rz(0.3141592653) {q}[1];")
+        block.append(f"cx {q}[0],{q}[1];")
+    else:
+        block.append(f"rz(0.3141592653) {q}[0];")
+
+    if ancilla_qubits > 0 and index_qubits > 0:
+        anc = index_qubits
+        block.append(f"cx {q}[0],{q}[{anc}];")
+        block.append(f"rz(0.1570796327) {q}[{anc}];")
+        block.append(f"cx {q}[0],{q}[{anc}];")
+    lines.extend(block * reps)
 
     lines.append(f"measure {q}[0] -> c[0];")
-    return "\n".join(lines) + "\n"
+    lines.append("")
+    return "\n".join(lines)
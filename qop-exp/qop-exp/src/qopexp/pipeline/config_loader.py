@@ -7,6 +7,9 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it; same documents, C scanner/parser.
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass(frozen=True)
 class LoadedConfig:
@@ -19,7 +22,7 @@ def load_yaml_config(path: str | Path) -> LoadedConfig:
     if not p.exists():
         raise FileNotFoundError(f"Config not found: {p}")
     with p.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=_YAML_SAFE_LOADER) or {}
     if not isinstance(data, dict):
         raise ValueError(f"Config root must be a mapping/dict: {p}")
     # Inject path for downstream hashing/lineage (adapters already look for __config_path__)
@@ -122,11 +122,11 @@ def run_experiment(
 
     # 6) Submit + ingest
     logger.info("Submitting jobs to backend")
-    backend_registry = get_backend_registry(store)
-    job_env = backend_registry.submit(backend_cfg.data, compiled_env)
+    backend = get_backend_registry(store).prepare(backend_cfg.data)
+    job_env = backend.submit(compiled_env)
 
     logger.info("Ingesting results from backend")
-    raw_env = backend_registry.ingest(backend_cfg.data, job_env)
+    raw_env = backend.ingest(job_env)
 
        # 7) Baselines (optional but recommended for apples-to-apples table)
     logger.info("Running classical baselines (if any)")
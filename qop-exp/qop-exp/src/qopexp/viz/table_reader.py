@@ -11,5 +11,7 @@ def read_curated_table(curated_artifact_dir: Path, table_rel_path: str) -> pd.Da
     p = curated_artifact_dir / table_rel_path
     if not p.exists():
         raise FileNotFoundError(f"Curated table not found: {p}")
+    if p.suffix == ".parquet":
+        return pd.read_parquet(p)
     df = pd.read_csv(p)
     return df
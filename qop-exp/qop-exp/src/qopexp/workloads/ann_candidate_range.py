@@ -13,6 +13,9 @@ from qopexp.workloads.utils import expand_env_vars, require, stable_id
 
 
 def _load_npz(path: Path) -> Dict[str, np.ndarray]:
+    # Directory of .npy files (one per array): memory-map instead of reading eagerly.
+    if path.is_dir():
+        return {p.stem: np.load(p, allow_pickle=False, mmap_mode="r") for p in sorted(path.glob("*.npy"))}
     with np.load(path, allow_pickle=False) as z:
         return {k: z[k] for k in z.files}
 